@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare the memory retained by feedparser entries and compact Entry objects.
+
+Usage:
+    python benchmarks/entry_memory.py [--feeds 200] [--entries 50]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import feedparser
+
+from models import Entry
+
+
+def make_feed(feed_index: int, entry_count: int) -> str:
+    """Build an RSS document with full-content items like real blog feeds."""
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing. " * 20 + "</p>"
+    items = []
+    for i in range(entry_count):
+        items.append(
+            f"""<item>
+            <title>Post {i} of feed {feed_index}</title>
+            <link>https://feed{feed_index}.example.com/posts/{i}</link>
+            <guid>https://feed{feed_index}.example.com/posts/{i}</guid>
+            <pubDate>Mon, 02 Oct 2023 {i % 24:02d}:00:00 GMT</pubDate>
+            <description><![CDATA[{paragraph}]]></description>
+            <content:encoded><![CDATA[{paragraph * 5}]]></content:encoded>
+            <enclosure url="https://feed{feed_index}.example.com/{i}.mp3" length="1" type="audio/mpeg"/>
+            </item>"""
+        )
+    return f"""<?xml version="1.0"?>
+    <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+    <channel><title>Feed {feed_index}</title><link>https://feed{feed_index}.example.com/</link>
+    {''.join(items)}
+    </channel></rss>"""
+
+
+def measure(feeds, compact: bool) -> int:
+    """Parse every feed and return the peak traced memory of the kept entries."""
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for feed_index, document in enumerate(feeds):
+        parsed = feedparser.parse(document)
+        feed_info = {"title": f"Feed {feed_index}", "url": f"https://feed{feed_index}.example.com/rss"}
+        if compact:
+            kept.extend(Entry.from_parsed(entry, feed_info, None) for entry in parsed.entries)
+        else:
+            for entry in parsed.entries:
+                entry["feed_title"] = feed_info["title"]
+                entry["feed_url"] = feed_info["url"]
+            kept.extend(parsed.entries)
+        del parsed
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=50)
+    args = parser.parse_args()
+
+    feeds = [make_feed(i, args.entries) for i in range(args.feeds)]
+    total = args.feeds * args.entries
+    print(f"📊 {args.feeds} feeds x {args.entries} entries = {total} entries")
+
+    for label, compact in (("FeedParserDict", False), ("Entry", True)):
+        current, peak = measure(feeds, compact)
+        print(
+            f"{label:>15}: retained {current / 1024 / 1024:7.1f} MiB, "
+            f"peak {peak / 1024 / 1024:7.1f} MiB, "
+            f"{current / total:8.0f} bytes/entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Local HTTP stand-in serving generated feeds, homepages and favicons.
+
+Used by the benchmarks to exercise RSSHub without touching the network.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from xml.sax.saxutils import escape, quoteattr
+
+
+class SyntheticFeedServer:
+    """
+    Serve feed_count generated feeds on 127.0.0.1.
+
+    Even feeds are RSS 2.0 and odd feeds are Atom. Each feed links to a
+    homepage that declares an icon. A deterministic error_rate share of the
+    feeds fails with 503 or 404, and every response is delayed by latency
+    seconds. Feeds send an ETag and answer If-None-Match with 304.
+    """
+
+    def __init__(
+        self,
+        feed_count: int,
+        entries_per_feed: int = 20,
+        summary_bytes: int = 1000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.feed_count = feed_count
+        self.entries_per_feed = entries_per_feed
+        self.summary_bytes = summary_bytes
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self._documents = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "SyntheticFeedServer":
+        """Start serving in a background thread."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, send_body=True)
+
+            def do_HEAD(self):
+                server._handle(self, send_body=False)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def feed_url(self, index: int) -> str:
+        return f"{self.base_url}/feeds/{index}.xml"
+
+    def write_opml(self, path: str, categories: int = 5):
+        """
+        Write an OPML file subscribing to every served feed.
+
+        Args:
+            path: Output file path
+            categories: Number of category folders the feeds are spread over
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n<opml version="1.0">\n')
+            f.write("<head><title>Benchmark</title></head>\n<body>\n")
+            for category in range(categories):
+                f.write(f'<outline text="Category {category}">\n')
+                for index in range(category, self.feed_count, categories):
+                    f.write(
+                        f'<outline type="rss" text="Feed {index}" '
+                        f"xmlUrl={quoteattr(self.feed_url(index))}/>\n"
+                    )
+                f.write("</outline>\n")
+            f.write("</body>\n</opml>\n")
+
+    def _error_status(self, index: int) -> Optional[int]:
+        rng = random.Random(self.seed * 1_000_003 + index)
+        if rng.random() < self.error_rate:
+            return 503 if index % 2 else 404
+        return None
+
+    def _feed_document(self, index: int) -> bytes:
+        with self._lock:
+            document = self._documents.get(index)
+        if document is not None:
+            return document
+
+        rng = random.Random(self.seed * 1_000_003 + index)
+        words = ("lovely", "rss", "feed", "python", "static", "site", "post", "news")
+        site = f"{self.base_url}/sites/{index}/"
+        now = int(time.time())
+        items = []
+        for number in range(self.entries_per_feed):
+            published = now - rng.randrange(0, 90 * 24 * 3600)
+            summary = " ".join(rng.choice(words) for _ in range(self.summary_bytes // 6))
+            link = f"{site}posts/{number}"
+            title = f"Post {number} from feed {index}"
+            if index % 2 == 0:
+                items.append(
+                    f"<item><title>{title}</title><link>{link}</link>"
+                    f"<guid>{link}</guid><pubDate>{formatdate(published, usegmt=True)}</pubDate>"
+                    f"<description>{escape('<p>' + summary + '</p>')}</description></item>"
+                )
+            else:
+                stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(published))
+                items.append(
+                    f"<entry><title>{title}</title><link href={quoteattr(link)}/>"
+                    f"<id>{link}</id><updated>{stamp}</updated>"
+                    f"<summary type=\"html\">{escape('<p>' + summary + '</p>')}</summary></entry>"
+                )
+
+        if index % 2 == 0:
+            document = (
+                '<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>'
+                f"<title>Feed {index}</title><link>{site}</link>"
+                f"<description>Synthetic feed {index}</description>"
+                + "".join(items)
+                + "</channel></rss>"
+            )
+        else:
+            document = (
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                '<feed xmlns="http://www.w3.org/2005/Atom">'
+                f"<title>Feed {index}</title><link href={quoteattr(site)}/>"
+                f"<id>{site}</id>" + "".join(items) + "</feed>"
+            )
+        document = document.encode("utf-8")
+        with self._lock:
+            self._documents[index] = document
+        return document
+
+    def _handle(self, handler: BaseHTTPRequestHandler, send_body: bool):
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = handler.path.split("?", 1)[0]
+        parts = path.strip("/").split("/")
+        status, content_type, body, headers = 404, "text/plain", b"not found", {}
+
+        if len(parts) == 2 and parts[0] == "feeds" and parts[1].endswith(".xml"):
+            index = int(parts[1][:-4])
+            error = self._error_status(index)
+            if error:
+                status, body = error, b"error"
+            else:
+                body = self._feed_document(index)
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                headers["ETag"] = etag
+                if handler.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                else:
+                    status, content_type = 200, "application/rss+xml"
+        elif len(parts) >= 2 and parts[0] == "sites":
+            if parts[-1] == "icon.png":
+                status, content_type, body = 200, "image/png", b"\x89PNG"
+            elif len(parts) == 2:
+                icon = f"/sites/{parts[1]}/icon.png"
+                body = (
+                    f'<html><head><link rel="icon" href="{icon}"></head>'
+                    f"<body>Site {parts[1]}</body></html>"
+                ).encode("utf-8")
+                status, content_type = 200, "text/html"
+        elif path == "/favicon.ico":
+            status, content_type, body = 200, "image/x-icon", b"\x00"
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        if send_body and status != 304:
+            handler.wfile.write(body)
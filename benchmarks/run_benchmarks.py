@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Time the main() stages of RSSHub against a local synthetic feed server.
+
+Each feed count runs in its own subprocess with a fresh state directory,
+so the reported peak memory belongs to that run alone.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--feeds 10 100 1000 10000]
+        [--entries 20] [--summary-bytes 1000] [--latency 0.0]
+        [--error-rate 0.0] [--workers 8] [--parse-workers 0] [--warm]
+        [--json results.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from feed_server import SyntheticFeedServer
+
+STAGES = (
+    "process_feeds",
+    "generate_latest_rss",
+    "generate_latest_feeds",
+    "generate_site_data",
+    "generate_html",
+    "precompress_outputs",
+    "save_state",
+)
+
+
+def write_config(path: str, workers: int, parse_workers: int):
+    """Write a config like config.json.template with outputs in the cwd."""
+    template = Path(__file__).parent.parent / "config.json.template"
+    with open(template, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    config["fetch"] = dict(
+        config.get("fetch", {}), max_workers=workers, parse_workers=parse_workers
+    )
+    # Every synthetic site shares the server's origin, so the origin-keyed
+    # favicon cache would resolve one icon for all feeds; bypass it so each
+    # feed pays for a lookup like distinct real sites do on a cold run
+    config["favicon"] = dict(config.get("favicon", {}), force_refresh=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+
+def run_pass(state_dir: str) -> dict:
+    """
+    Run the main() stages once in state_dir.
+
+    Args:
+        state_dir: Directory holding the OPML, config and all state files
+
+    Returns:
+        Wall time, per-stage times and entry count
+    """
+    from fetch_feeds import RSSHub
+
+    stage_times = {}
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        hub = RSSHub(
+            os.path.join(state_dir, "feeds.opml"),
+            os.path.join(state_dir, "config.json"),
+            os.path.join(state_dir, "last_run.json"),
+        )
+        site_data = None
+        for stage in STAGES:
+            stage_start = time.perf_counter()
+            if stage == "generate_site_data":
+                site_data = hub.generate_site_data()
+            elif stage == "generate_html":
+                hub.generate_html(site_data)
+            else:
+                getattr(hub, stage)()
+            stage_times[stage] = time.perf_counter() - stage_start
+        if hub.entry_store:
+            hub.entry_store.close()
+
+    return {
+        "wall_time": time.perf_counter() - start,
+        "stages": stage_times,
+        "feeds": len(hub.feeds_with_updates),
+        "entries": len(hub.all_entries),
+    }
+
+
+def run_child(args) -> dict:
+    """Benchmark one feed count inside this process."""
+    with SyntheticFeedServer(
+        args.child,
+        entries_per_feed=args.entries,
+        summary_bytes=args.summary_bytes,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as server, tempfile.TemporaryDirectory() as state_dir:
+        server.write_opml(os.path.join(state_dir, "feeds.opml"))
+        write_config(
+            os.path.join(state_dir, "config.json"), args.workers, args.parse_workers
+        )
+
+        cwd = os.getcwd()
+        os.chdir(state_dir)
+        try:
+            passes = [run_pass(state_dir)]
+            if args.warm:
+                passes.append(run_pass(state_dir))
+        finally:
+            os.chdir(cwd)
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    return {"feed_count": args.child, "passes": passes, "peak_rss": max_rss}
+
+
+def run_scale(feed_count: int, args) -> dict:
+    """Benchmark one feed count in a fresh subprocess."""
+    command = [
+        sys.executable,
+        __file__,
+        "--child",
+        str(feed_count),
+        "--entries",
+        str(args.entries),
+        "--summary-bytes",
+        str(args.summary_bytes),
+        "--latency",
+        str(args.latency),
+        "--error-rate",
+        str(args.error_rate),
+        "--workers",
+        str(args.workers),
+        "--parse-workers",
+        str(args.parse_workers),
+        "--seed",
+        str(args.seed),
+    ]
+    if args.warm:
+        command.append("--warm")
+    output = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def print_results(results: list):
+    """Print one table row per feed count and pass."""
+    short_names = {
+        "process_feeds": "fetch",
+        "generate_latest_rss": "rss",
+        "generate_latest_feeds": "feeds",
+        "generate_site_data": "site",
+        "generate_html": "html",
+        "precompress_outputs": "gzip",
+        "save_state": "state",
+    }
+    header = f"{'feeds':>7} {'pass':>5} {'entries':>8} {'wall':>8} "
+    header += " ".join(f"{short_names[stage]:>7}" for stage in STAGES)
+    header += f" {'peak MB':>8}"
+    print(header)
+    for result in results:
+        for number, run in enumerate(result["passes"]):
+            row = f"{result['feed_count']:>7} {'cold' if number == 0 else 'warm':>5} "
+            row += f"{run['entries']:>8} {run['wall_time']:>7.2f}s "
+            row += " ".join(f"{run['stages'][stage]:>6.2f}s" for stage in STAGES)
+            row += f" {result['peak_rss'] / (1024 * 1024):>8.1f}"
+            print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--feeds", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--entries", type=int, default=20, help="Entries per feed")
+    parser.add_argument(
+        "--summary-bytes", type=int, default=1000, help="Summary size per entry"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of feeds failing"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="fetch.max_workers")
+    parser.add_argument(
+        "--parse-workers", type=int, default=0, help="fetch.parse_workers"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--warm", action="store_true", help="Run a second pass reusing the state"
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_child(args)))
+        return
+
+    results = []
+    for feed_count in args.feeds:
+        print(f"⏱️  Benchmarking {feed_count} feeds...", file=sys.stderr)
+        results.append(run_scale(feed_count, args))
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
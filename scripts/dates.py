@@ -0,0 +1,105 @@
+"""
+Date parsing that normalizes feed dates to UTC epoch seconds
+"""
+
+import calendar
+import re
+from datetime import datetime, timezone
+from email.utils import mktime_tz, parsedate_tz
+from functools import lru_cache
+from typing import Optional, Sequence
+
+# Zone abbreviations dateutil does not know on its own
+TZINFOS = {
+    "UT": timezone.utc,
+    "UTC": timezone.utc,
+    "GMT": timezone.utc,
+}
+
+# Dates in the shape datetime.fromisoformat accepts on every supported
+# Python version: YYYY-MM-DD[THH:MM[:SS[.ffffff]]][+HH:MM]
+ISO_8601 = re.compile(
+    r"^\d{4}-\d{2}-\d{2}"
+    r"([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?"
+    r"([+-]\d{2}:\d{2})?$"
+)
+
+
+def struct_to_epoch(parsed_time: Optional[Sequence[int]]) -> int:
+    """
+    Convert a UTC time tuple, as feedparser provides, to a UTC epoch.
+
+    Args:
+        parsed_time: struct_time or 9-item list from the feed cache
+
+    Returns:
+        Seconds since the epoch, or 0 if there is no time
+    """
+    return calendar.timegm(tuple(parsed_time)) if parsed_time else 0
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str: Optional[str]) -> int:
+    """
+    Parse a feed date to a UTC epoch.
+
+    RFC 822 dates (RSS) and ISO 8601 dates (Atom) take a fast path; other
+    formats fall back to dateutil. Dates without a zone are taken as UTC.
+    Feeds repeat the same dates across runs and entries, so results are
+    cached.
+
+    Args:
+        date_str: Date string from a feed
+
+    Returns:
+        Seconds since the epoch, or 0 if the date cannot be parsed
+    """
+    if not date_str:
+        return 0
+    date_str = date_str.strip()
+
+    if date_str[:4].isdigit():
+        iso_str = date_str[:-1] + "+00:00" if date_str[-1:] in "Zz" else date_str
+        if ISO_8601.match(iso_str):
+            try:
+                return _datetime_to_epoch(datetime.fromisoformat(iso_str))
+            except ValueError:
+                pass
+    else:
+        parsed = parsedate_tz(date_str)
+        if parsed is not None:
+            try:
+                # mktime_tz treats a missing zone as local time
+                if parsed[9] is None:
+                    parsed = parsed[:9] + (0,)
+                return int(mktime_tz(parsed))
+            except (OverflowError, ValueError):
+                pass
+
+    try:
+        from dateutil import parser
+
+        return _datetime_to_epoch(parser.parse(date_str, tzinfos=TZINFOS))
+    except (ValueError, OverflowError):
+        return 0
+
+
+def _datetime_to_epoch(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def epoch_to_iso(timestamp: int) -> Optional[str]:
+    """
+    Format a UTC epoch as an ISO 8601 string with its zone.
+
+    Args:
+        timestamp: Seconds since the epoch
+
+    Returns:
+        ISO 8601 string, or None for 0
+    """
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
@@ -0,0 +1,153 @@
+"""
+Cross-feed entry deduplication
+"""
+
+import re
+import time
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from models import entry_timestamp
+
+# Which copy of a duplicated entry is kept
+DEDUP_POLICIES = ("first", "earliest", "latest")
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|source)$")
+
+
+def normalize_link(link: str) -> str:
+    """
+    Normalize a link so copies of an article compare equal.
+
+    The scheme, a leading "www.", the fragment, tracking parameters and a
+    trailing slash are dropped, and the host is lowercased.
+
+    Args:
+        link: Entry link
+
+    Returns:
+        Normalized link, or "" if there is none
+    """
+    if not link:
+        return ""
+    parsed = urlparse(link.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        [
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not TRACKING_PARAMS.match(key)
+        ]
+    )
+    path = parsed.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def entry_keys(entry) -> List[str]:
+    """
+    Get the keys under which an entry is indexed.
+
+    Args:
+        entry: Entry or entry dictionary
+
+    Returns:
+        Link, GUID and title+date keys; missing parts produce no key
+    """
+    keys = []
+    link = normalize_link(entry.get("link") or "")
+    if link:
+        keys.append("link:" + link)
+
+    # Only GUIDs that look globally unique (URLs, URNs, tag: URIs) are
+    # compared across feeds; plain counters like "42" are not
+    guid = (entry.get("id") or "").strip()
+    if ":" in guid or "/" in guid:
+        keys.append("guid:" + guid)
+
+    title = " ".join((entry.get("title") or "").split()).casefold()
+    published_ts = entry_timestamp(entry)
+    if title and published_ts:
+        day = time.strftime("%Y-%m-%d", time.gmtime(published_ts))
+        keys.append(f"title:{title}\n{day}")
+    return keys
+
+
+class DedupIndex:
+    """
+    Entries from all feeds with cross-feed duplicates collapsed into one.
+
+    Every key of a kept entry maps to its slot, so each lookup is O(1).
+    When a duplicate arrives, the policy decides which copy keeps the slot:
+    "first" keeps the copy seen first (OPML order), "earliest" and
+    "latest" keep the copy with the earliest or latest publication time.
+    """
+
+    def __init__(self, policy: str = "first"):
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(
+                f"Unknown dedup policy {policy!r}, expected one of {DEDUP_POLICIES}"
+            )
+        self.policy = policy
+        self.entries: List = []
+        self.slots: Dict[str, int] = {}
+        self.removed: List = []
+
+    def add(self, entry) -> bool:
+        """
+        Add an entry unless a copy of it is already indexed.
+
+        Args:
+            entry: Entry with feed metadata attached
+
+        Returns:
+            True if the entry was kept, replacing a copy if there was one
+        """
+        keys = entry_keys(entry)
+        slot = next((self.slots[key] for key in keys if key in self.slots), None)
+
+        # Entries of one feed are never collapsed; some feeds link every
+        # entry to the same page
+        if slot is not None and (
+            self.entries[slot].get("feed_url") == entry.get("feed_url")
+        ):
+            self.entries.append(entry)
+            for key in keys:
+                self.slots.setdefault(key, len(self.entries) - 1)
+            return True
+
+        if slot is None:
+            slot = len(self.entries)
+            self.entries.append(entry)
+        elif self._wins(entry, self.entries[slot]):
+            self.removed.append(self.entries[slot])
+            self.entries[slot] = entry
+        else:
+            self.removed.append(entry)
+            # Remember the loser's keys too, so later copies find the slot
+            for key in keys:
+                self.slots.setdefault(key, slot)
+            return False
+
+        for key in keys:
+            self.slots[key] = slot
+        return True
+
+    def extend(self, entries: Iterable):
+        """Add several entries."""
+        for entry in entries:
+            self.add(entry)
+
+    def _wins(self, entry, kept) -> bool:
+        if self.policy == "first":
+            return False
+        published, kept_published = entry_timestamp(entry), entry_timestamp(kept)
+        if not published:
+            return False
+        if not kept_published:
+            return True
+        if self.policy == "earliest":
+            return published < kept_published
+        return published > kept_published
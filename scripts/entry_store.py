@@ -0,0 +1,397 @@
+"""
+Persistent SQLite entry store shared between runs
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models import Entry, entry_timestamp
+
+# GUIDs are only unique within a feed, so entries are keyed per feed;
+# collapsing copies across feeds is left to the dedup stage
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    guid TEXT NOT NULL,
+    feed_url TEXT NOT NULL,
+    feed_title TEXT,
+    feed_category TEXT,
+    feed_favicon_url TEXT,
+    title TEXT,
+    link TEXT,
+    summary TEXT,
+    published TEXT,
+    published_ts INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT NOT NULL,
+    last_seen INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (feed_url, guid)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_feed_published
+    ON entries (feed_url, published_ts DESC);
+CREATE INDEX IF NOT EXISTS idx_entries_published
+    ON entries (published_ts DESC);
+CREATE TABLE IF NOT EXISTS search_terms (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_terms_doc
+    ON search_terms (doc_id);
+CREATE TABLE IF NOT EXISTS search_indexed (
+    doc_id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_keys (
+    key TEXT NOT NULL,
+    feed_url TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    PRIMARY KEY (key, feed_url, guid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_dedup_keys_entry
+    ON dedup_keys (feed_url, guid);
+CREATE TRIGGER IF NOT EXISTS entries_dedup_keys_update
+    AFTER UPDATE OF content_hash ON entries
+BEGIN
+    DELETE FROM dedup_keys WHERE feed_url = old.feed_url AND guid = old.guid;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_dedup_keys_delete
+    AFTER DELETE ON entries
+BEGIN
+    DELETE FROM dedup_keys WHERE feed_url = old.feed_url AND guid = old.guid;
+END;
+"""
+
+# Entry fields stored as columns, in table order after guid
+ENTRY_FIELDS = (
+    "feed_url",
+    "feed_title",
+    "feed_category",
+    "feed_favicon_url",
+    "title",
+    "link",
+    "summary",
+    "published",
+)
+
+
+def entry_guid(entry: Dict) -> str:
+    """
+    Get a stable identifier for an entry.
+
+    Args:
+        entry: Feed entry
+
+    Returns:
+        The entry id or link, or a hash of its feed, title and date
+    """
+    guid = entry.get("id") or entry.get("link")
+    if guid:
+        return guid
+
+    fingerprint = "\n".join(
+        str(entry.get(key) or "") for key in ("feed_url", "title", "published")
+    )
+    return "sha1:" + hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+
+
+def entry_key(entry: Dict) -> Tuple[str, str]:
+    """
+    Get the key of an entry in the store.
+
+    Args:
+        entry: Feed entry with feed metadata attached
+
+    Returns:
+        Feed URL and the identifier from entry_guid
+    """
+    return entry.get("feed_url") or "", entry_guid(entry)
+
+
+class EntryStore:
+    """Entries from every run, indexed by feed URL and publication time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def upsert_entries(
+        self,
+        entries: Iterable[Dict],
+        entry_keys: Optional[Callable[[Dict], List[str]]] = None,
+    ) -> int:
+        """
+        Insert new entries and update the ones whose content changed.
+
+        Args:
+            entries: Feed entries with feed metadata attached
+            entry_keys: Function returning the dedup keys of an entry, so
+                later runs can find stored copies (optional)
+
+        Returns:
+            Number of entries inserted or updated
+        """
+        entries = list(entries)
+        rows = []
+        for entry in entries:
+            values = [entry.get(field) or "" for field in ENTRY_FIELDS]
+            published_ts = entry_timestamp(entry)
+            content_hash = hashlib.sha1(
+                "\0".join(values + [str(published_ts)]).encode("utf-8")
+            ).hexdigest()
+            rows.append([entry_guid(entry)] + values + [published_ts, content_hash])
+
+        now = int(time.time())
+        with self.connection:
+            cursor = self.connection.executemany(
+                """
+                INSERT INTO entries (guid, feed_url, feed_title, feed_category,
+                    feed_favicon_url, title, link, summary, published,
+                    published_ts, content_hash, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (feed_url, guid) DO UPDATE SET
+                    feed_title = excluded.feed_title,
+                    feed_category = excluded.feed_category,
+                    feed_favicon_url = excluded.feed_favicon_url,
+                    title = excluded.title,
+                    link = excluded.link,
+                    summary = excluded.summary,
+                    published = excluded.published,
+                    published_ts = excluded.published_ts,
+                    content_hash = excluded.content_hash
+                WHERE entries.content_hash != excluded.content_hash
+                """,
+                [row + [now] for row in rows],
+            )
+            # Undated entries age by when a feed last carried them
+            self.connection.executemany(
+                "UPDATE entries SET last_seen = ? WHERE feed_url = ? AND guid = ?",
+                ((now, row[1], row[0]) for row in rows),
+            )
+            if entry_keys:
+                # Keys of changed entries were dropped by a trigger
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO dedup_keys (key, feed_url, guid) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        (key, row[1], row[0])
+                        for entry, row in zip(entries, rows)
+                        for key in entry_keys(entry)
+                    ),
+                )
+        # rowcount, unlike total_changes, leaves out rows changed by triggers
+        return cursor.rowcount
+
+    def latest(self, limit: int) -> List[Entry]:
+        """
+        Get the most recently published entries across all feeds.
+
+        Args:
+            limit: Maximum number of entries
+
+        Returns:
+            Entries, newest first
+        """
+        cursor = self.connection.execute(
+            "SELECT * FROM entries ORDER BY published_ts DESC, rowid LIMIT ?",
+            (limit,),
+        )
+        return [self._row_to_entry(row) for row in cursor]
+
+    def latest_for_feed(self, feed_url: str, limit: int) -> List[Entry]:
+        """
+        Get the most recently published entries of one feed.
+
+        Args:
+            feed_url: Feed URL
+            limit: Maximum number of entries
+
+        Returns:
+            Entries, newest first
+        """
+        cursor = self.connection.execute(
+            "SELECT * FROM entries WHERE feed_url = ? "
+            "ORDER BY published_ts DESC, rowid LIMIT ?",
+            (feed_url, limit),
+        )
+        return [self._row_to_entry(row) for row in cursor]
+
+    def entries_after(self, key: Optional[list] = None) -> List[Entry]:
+        """
+        Get the entries ordered after a (published_ts, feed_url, guid) key.
+
+        Args:
+            key: Publication epoch, feed URL and GUID; None returns every entry
+
+        Returns:
+            Entries, newest first
+        """
+        if key is None:
+            cursor = self.connection.execute(
+                "SELECT * FROM entries "
+                "ORDER BY published_ts DESC, feed_url DESC, guid DESC"
+            )
+        else:
+            cursor = self.connection.execute(
+                "SELECT * FROM entries "
+                "WHERE (published_ts, feed_url, guid) > (?, ?, ?) "
+                "ORDER BY published_ts DESC, feed_url DESC, guid DESC",
+                key,
+            )
+        return [self._row_to_entry(row) for row in cursor]
+
+    def remove(self, keys: Iterable[Tuple[str, str]]) -> int:
+        """
+        Remove entries by feed and identifier.
+
+        Args:
+            keys: (feed URL, identifier from entry_guid) pairs
+
+        Returns:
+            Number of entries removed
+        """
+        with self.connection:
+            cursor = self.connection.executemany(
+                "DELETE FROM entries WHERE feed_url = ? AND guid = ?", keys
+            )
+        return cursor.rowcount
+
+    def find_copies(self, keys: Iterable[str]) -> List[Entry]:
+        """
+        Get the stored entries indexed under any of the given dedup keys.
+
+        Args:
+            keys: Dedup keys, as passed to upsert_entries
+
+        Returns:
+            Entries, in the order they were first stored
+        """
+        with self.connection:
+            self.connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS lookup (key TEXT PRIMARY KEY)"
+            )
+            self.connection.execute("DELETE FROM lookup")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO lookup (key) VALUES (?)",
+                ((key,) for key in keys),
+            )
+            cursor = self.connection.execute(
+                """
+                SELECT * FROM entries WHERE rowid IN (
+                    SELECT entries.rowid FROM lookup
+                    JOIN dedup_keys ON dedup_keys.key = lookup.key
+                    JOIN entries ON entries.feed_url = dedup_keys.feed_url
+                        AND entries.guid = dedup_keys.guid
+                )
+                ORDER BY rowid
+                """
+            )
+            return [self._row_to_entry(row) for row in cursor]
+
+    def update_search_index(self, entry_terms: Callable[[Entry], Set[str]]) -> int:
+        """
+        Index the entries added or changed since the last update.
+
+        Entries are identified in the index by their rowid, which stays the
+        same when an entry is updated. Terms of removed entries are dropped.
+
+        Args:
+            entry_terms: Function returning the index terms of an entry
+
+        Returns:
+            Number of entries indexed
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM search_indexed "
+                "WHERE doc_id NOT IN (SELECT rowid FROM entries)"
+            )
+            self.connection.execute(
+                "DELETE FROM search_terms "
+                "WHERE doc_id NOT IN (SELECT doc_id FROM search_indexed)"
+            )
+            rows = self.connection.execute(
+                """
+                SELECT entries.rowid AS doc_id, entries.* FROM entries
+                LEFT JOIN search_indexed ON search_indexed.doc_id = entries.rowid
+                WHERE search_indexed.content_hash IS NOT entries.content_hash
+                """
+            ).fetchall()
+            for row in rows:
+                self.connection.execute(
+                    "DELETE FROM search_terms WHERE doc_id = ?", (row["doc_id"],)
+                )
+                self.connection.executemany(
+                    "INSERT INTO search_terms (term, doc_id) VALUES (?, ?)",
+                    (
+                        (term, row["doc_id"])
+                        for term in entry_terms(self._row_to_entry(row))
+                    ),
+                )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO search_indexed (doc_id, content_hash) "
+                "VALUES (?, ?)",
+                ((row["doc_id"], row["content_hash"]) for row in rows),
+            )
+        return len(rows)
+
+    def search_postings(self) -> Iterator[Tuple[str, int]]:
+        """Get the (term, doc_id) pairs of the search index, sorted."""
+        return (
+            (row[0], row[1])
+            for row in self.connection.execute(
+                "SELECT term, doc_id FROM search_terms ORDER BY term, doc_id"
+            )
+        )
+
+    def search_documents(self) -> Iterator[Tuple[int, Entry]]:
+        """Get the indexed entries with their search index doc_id."""
+        cursor = self.connection.execute(
+            "SELECT entries.rowid AS doc_id, entries.* FROM entries "
+            "JOIN search_indexed ON search_indexed.doc_id = entries.rowid"
+        )
+        return ((row["doc_id"], self._row_to_entry(row)) for row in cursor)
+
+    def count(self) -> int:
+        """Get the number of stored entries."""
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def prune(self, feed_urls: Iterable[str], max_age_days: Optional[float] = None):
+        """
+        Remove entries of unsubscribed feeds and entries older than max_age_days.
+
+        Entries without a publication date are aged by the last run that
+        saw them in their feed.
+
+        Args:
+            feed_urls: URLs of the currently subscribed feeds
+            max_age_days: Maximum entry age in days (optional)
+        """
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS keep (url TEXT)")
+            self.connection.execute("DELETE FROM keep")
+            self.connection.executemany(
+                "INSERT INTO keep (url) VALUES (?)", ((url,) for url in feed_urls)
+            )
+            self.connection.execute(
+                "DELETE FROM entries WHERE feed_url NOT IN (SELECT url FROM keep)"
+            )
+            if max_age_days:
+                cutoff = int(time.time() - max_age_days * 24 * 60 * 60)
+                self.connection.execute(
+                    "DELETE FROM entries WHERE CASE WHEN published_ts > 0 "
+                    "THEN published_ts ELSE last_seen END < ?",
+                    (cutoff,),
+                )
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Entry:
+        # Empty strings were stored for missing fields
+        fields = {field: row[field] or None for field in ENTRY_FIELDS}
+        return Entry(id=row["guid"], published_ts=row["published_ts"], **fields)
@@ -0,0 +1,108 @@
+"""
+Persisted failure tracking that backs failing feeds off across runs
+"""
+
+import random
+import time
+from typing import Dict, Iterable, List, Optional
+
+from utils import load_json_file, save_json_file
+
+# HTTP status codes that quarantine a feed on the first failure
+QUARANTINE_STATUSES = frozenset({410})
+
+
+class FeedFailures:
+    """
+    Failure count, last error and retry time of each failing feed.
+
+    After n consecutive failures a feed is skipped for a random delay
+    between half and all of base_delay * 2 ** (n - 1), capped at
+    max_delay. Quarantined feeds are skipped until their entry is removed
+    from the state file or they leave the OPML file.
+    """
+
+    def __init__(self, path: str, base_delay: float, max_delay: float):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.feeds: Dict[str, dict] = load_json_file(path, {})
+
+    def is_blocked(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a feed is quarantined or still backing off.
+
+        Args:
+            feed_url: Feed URL
+            now: Current UTC epoch (optional)
+
+        Returns:
+            True if the feed should not be fetched in this run
+        """
+        failure = self.feeds.get(feed_url)
+        if not failure:
+            return False
+        if failure.get("quarantined"):
+            return True
+        now = time.time() if now is None else now
+        return now < failure.get("retry_after", 0)
+
+    def record_failure(
+        self,
+        feed_url: str,
+        error: Optional[str],
+        status: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> dict:
+        """
+        Count a failed fetch and schedule the next attempt.
+
+        Args:
+            feed_url: Feed URL
+            error: Error message
+            status: HTTP status code, if the server answered
+            now: Current UTC epoch (optional)
+
+        Returns:
+            The feed's updated failure record
+        """
+        now = time.time() if now is None else now
+        failure = self.feeds.get(feed_url, {})
+        failure["failures"] = failure.get("failures", 0) + 1
+        failure["last_error"] = error
+        failure["last_status"] = status
+        failure["last_failure"] = int(now)
+
+        delay = min(self.base_delay * 2 ** (failure["failures"] - 1), self.max_delay)
+        failure["retry_after"] = int(now + random.uniform(delay / 2, delay))
+        if status in QUARANTINE_STATUSES:
+            failure["quarantined"] = True
+
+        self.feeds[feed_url] = failure
+        return failure
+
+    def record_success(self, feed_url: str):
+        """
+        Forget a feed's failures after a successful fetch.
+
+        Args:
+            feed_url: Feed URL
+        """
+        self.feeds.pop(feed_url, None)
+
+    def quarantined(self) -> List[str]:
+        """Get the URLs of the quarantined feeds."""
+        return [url for url, failure in self.feeds.items() if failure.get("quarantined")]
+
+    def save(self, feed_urls: Iterable[str]):
+        """
+        Persist the failures, dropping feeds that are no longer subscribed.
+
+        Args:
+            feed_urls: URLs of the currently subscribed feeds
+        """
+        feed_urls = set(feed_urls)
+        save_json_file(
+            self.path,
+            {url: failure for url, failure in self.feeds.items() if url in feed_urls},
+        )
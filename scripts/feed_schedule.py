@@ -0,0 +1,116 @@
+"""
+Adaptive polling schedule based on each feed's publish cadence
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from utils import load_json_file, save_json_file
+
+# Number of recent publish intervals kept per feed
+HISTORY_SIZE = 20
+
+# Feeds due within this many seconds count as due, so a feed scheduled
+# just after the next workflow run is not pushed back a whole run
+DUE_GRACE_SECONDS = 5 * 60
+
+
+def publish_intervals(timestamps: Iterable[int]) -> List[int]:
+    """
+    Get the intervals between consecutive publications, newest first.
+
+    Args:
+        timestamps: Entry publication times as UTC epochs; 0 means undated
+
+    Returns:
+        Intervals in seconds between the most recent publications
+    """
+    dated = sorted({ts for ts in timestamps if ts}, reverse=True)[: HISTORY_SIZE + 1]
+    return [newer - older for newer, older in zip(dated, dated[1:])]
+
+
+class FeedSchedule:
+    """
+    Per-feed publish history and next-due times, persisted as JSON.
+
+    A feed is polled at half its median publish interval, clamped to
+    [min_interval, max_interval]; feeds without dated entries use
+    max_interval.
+    """
+
+    def __init__(self, path: str, min_interval: float, max_interval: float):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.feeds: Dict[str, dict] = load_json_file(path, {})
+
+    def is_due(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a feed should be fetched in this run.
+
+        Args:
+            feed_url: Feed URL
+            now: Current UTC epoch (optional)
+
+        Returns:
+            True if the feed has no history or its next-due time has come
+        """
+        history = self.feeds.get(feed_url)
+        if not history:
+            return True
+        now = time.time() if now is None else now
+        return history.get("next_due", 0) <= now + DUE_GRACE_SECONDS
+
+    def interval(self, intervals: List[int]) -> float:
+        """
+        Get the polling interval for a feed's publish intervals.
+
+        Args:
+            intervals: Publish intervals in seconds
+
+        Returns:
+            Seconds until the feed should be fetched again
+        """
+        if not intervals:
+            return self.max_interval
+        ordered = sorted(intervals)
+        median = ordered[len(ordered) // 2]
+        return min(max(median / 2, self.min_interval), self.max_interval)
+
+    def record_fetch(
+        self, feed_url: str, timestamps: Iterable[int], now: Optional[float] = None
+    ):
+        """
+        Update a feed's history after a successful fetch.
+
+        Args:
+            feed_url: Feed URL
+            timestamps: Publication times of the feed's entries as UTC epochs
+            now: Current UTC epoch (optional)
+        """
+        now = time.time() if now is None else now
+        timestamps = list(timestamps)
+        history = self.feeds.get(feed_url, {})
+
+        latest = max(timestamps, default=0)
+        if latest and latest != history.get("latest_entry"):
+            history["last_change"] = int(now)
+            history["latest_entry"] = latest
+            history["intervals"] = publish_intervals(timestamps)
+
+        history["last_checked"] = int(now)
+        history["next_due"] = int(now + self.interval(history.get("intervals", [])))
+        self.feeds[feed_url] = history
+
+    def save(self, feed_urls: Iterable[str]):
+        """
+        Persist the schedule, dropping feeds that are no longer subscribed.
+
+        Args:
+            feed_urls: URLs of the currently subscribed feeds
+        """
+        feed_urls = set(feed_urls)
+        save_json_file(
+            self.path,
+            {url: history for url, history in self.feeds.items() if url in feed_urls},
+        )
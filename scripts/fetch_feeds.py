@@ -4,25 +4,63 @@ lovelyRSS - Personal GitHub-based RSS hub
 Fetch and process RSS feeds from OPML file
 """
 
+import argparse
+import hashlib
+import heapq
+import io
 import json
 import os
 import sys
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import feedparser
 from jinja2 import Environment, FileSystemLoader
 
+from dates import epoch_to_iso, parse_date, struct_to_epoch
+from dedup import DedupIndex, entry_keys
+from entry_store import EntryStore, entry_key
+from feed_failures import FeedFailures
+from feed_schedule import FeedSchedule
+from models import Entry, entry_timestamp
+from precompress import COMPRESSED_SUFFIXES, precompress_files
+from retry import Deadline, RetryPolicy
+from rss_archive import HISTORY_NAMESPACE, RSSArchive, archive_page_name
+from search_index import (
+    DOCS_PER_SHARD,
+    MIN_TERM_LENGTH,
+    PREFIX_LENGTH,
+    STOPWORDS,
+    build_search_shards,
+    entry_terms,
+    index_entries,
+    search_document,
+)
+from xml_writer import XMLStreamWriter
 from utils import (
+    atomic_write,
     clean_html,
+    configure_http,
     fetch_with_retry,
     format_date,
     format_relative_time,
     get_current_timestamp,
     get_favicon_url,
     get_readable_timestamp,
+    keep_clean_html,
+    load_clean_html_cache,
+    load_json_file,
     safe_get_text,
+    save_clean_html_cache,
+    save_json_file,
+    save_json_shard,
     truncate_text,
     validate_url,
 )
@@ -33,6 +71,100 @@ from datetime import datetime, timezone, timedelta
 import toml
 
 
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+# Exit status of main() with --exit-status when no output changed
+UNCHANGED_EXIT_STATUS = 3
+
+# Fields kept when a parsed feed is cached between runs; these are the only
+# ones read by the output generators. The feed description is stored under
+# feedparser's key "subtitle", which FeedParserDict also reads as "description".
+CACHED_FEED_FIELDS = ("title", "link", "subtitle", "updated", "language")
+CACHED_ENTRY_FIELDS = ("title", "link", "summary", "published", "updated", "id")
+CACHED_TIME_FIELDS = ("published_parsed", "updated_parsed")
+
+
+def feed_to_cache(parsed: feedparser.FeedParserDict) -> dict:
+    """
+    Reduce a parsed feed to a JSON-serializable dictionary.
+
+    Args:
+        parsed: Parsed feed data
+
+    Returns:
+        Dictionary with the feed and entry fields used by the generators
+    """
+
+    def reduce(element, fields):
+        # Plain dict lookups bypass FeedParserDict's legacy key aliasing
+        data = {key: dict.get(element, key) for key in fields if dict.get(element, key)}
+        for key in CACHED_TIME_FIELDS:
+            if dict.get(element, key):
+                data[key] = list(dict.get(element, key))
+        return data
+
+    return {
+        "feed": reduce(parsed.feed, CACHED_FEED_FIELDS),
+        "entries": [reduce(entry, CACHED_ENTRY_FIELDS) for entry in parsed.entries],
+    }
+
+
+def feed_from_cache(data: dict) -> feedparser.FeedParserDict:
+    """
+    Rebuild a parsed feed from its cached dictionary.
+
+    Args:
+        data: Dictionary produced by feed_to_cache
+
+    Returns:
+        Parsed feed data
+    """
+
+    def restore(element):
+        restored = feedparser.FeedParserDict(element)
+        for key in CACHED_TIME_FIELDS:
+            if element.get(key):
+                restored[key] = time.struct_time(element[key])
+        return restored
+
+    return feedparser.FeedParserDict(
+        {
+            "feed": restore(data.get("feed", {})),
+            "entries": [restore(entry) for entry in data.get("entries", [])],
+            "bozo": False,
+        }
+    )
+
+
+def parse_feed_content(content: bytes) -> Tuple[dict, Optional[str]]:
+    """
+    Parse a downloaded feed into a plain, picklable record.
+
+    Runs in the parse worker processes.
+
+    Args:
+        content: Feed document as downloaded
+
+    Returns:
+        Tuple of the feed_to_cache record and the parser's warning, if any
+    """
+    parsed = feedparser.parse(content)
+    warning = None
+    if parsed.bozo and parsed.bozo_exception:
+        warning = str(parsed.bozo_exception)
+    return feed_to_cache(parsed), warning
+
+
+def entry_sort_key(entry) -> int:
+    """Sort key ordering entries by publication date."""
+    return entry_timestamp(entry)
+
+
+def feed_sort_key(feed: dict) -> int:
+    """Sort key ordering feeds by latest post date, then feed update date."""
+    return feed.get("latest_post_ts") or feed.get("updated_ts") or 0
+
+
 class RSSHub:
     """Main RSS hub processor."""
 
@@ -66,11 +198,102 @@ class RSSHub:
             pyproject = toml.load(f)
             self.version = pyproject["project"]["version"]
 
+        # Share one pooled HTTP session across all feed and favicon requests
+        configure_http(
+            self.config.get("http"),
+            fetch_workers=self.config.get("fetch", {}).get("max_workers", 8),
+        )
+
         self.last_run_file = last_run_file
+        self.feed_cache_file = os.path.join(
+            os.path.dirname(last_run_file), "feed_cache.json"
+        )
+        self.feed_cache = load_json_file(self.feed_cache_file, {})
+        self.favicon_cache_file = os.path.join(
+            os.path.dirname(last_run_file), "favicon_cache.json"
+        )
+        self.favicon_cache = load_json_file(self.favicon_cache_file, {})
+        self.clean_html_cache_file = os.path.join(
+            os.path.dirname(last_run_file), "clean_html_cache.json"
+        )
+        load_clean_html_cache(self.clean_html_cache_file)
         self.feeds = []
         self.all_entries = []
         self.feeds_with_updates = []
 
+        # Per-feed fetch/parse telemetry for the run report, keyed by feed URL
+        self.feed_stats = {}
+        self.run_report_file = os.path.join(
+            os.path.dirname(last_run_file), "run_report.json"
+        )
+
+        # Retry policy for feed requests; the run deadline is set when
+        # process_feeds starts
+        fetch_config = self.config.get("fetch", {})
+        self.retry_policy = RetryPolicy(
+            retries=fetch_config.get("retries", 3),
+            base_delay=fetch_config.get("backoff_base_seconds", 0.5),
+            max_delay=fetch_config.get("backoff_max_seconds", 30),
+        )
+        self.deadline = Deadline()
+        self.max_bytes = fetch_config.get("max_bytes")
+
+        # Process pool parsing downloaded feeds, running during process_feeds
+        self.parse_pool = None
+
+        # Optional polling schedule that skips feeds which are not due yet
+        self.schedule = None
+        schedule_config = self.config.get("schedule", {})
+        if schedule_config.get("enabled"):
+            self.schedule = FeedSchedule(
+                os.path.join(os.path.dirname(last_run_file), "feed_schedule.json"),
+                schedule_config.get("min_interval_minutes", 60) * 60,
+                schedule_config.get("max_interval_hours", 24) * 60 * 60,
+            )
+
+        # Optional failure tracking that backs failing feeds off across runs
+        self.failures = None
+        backoff_config = self.config.get("backoff", {})
+        if backoff_config.get("enabled"):
+            self.failures = FeedFailures(
+                os.path.join(os.path.dirname(last_run_file), "feed_failures.json"),
+                backoff_config.get("base_delay_minutes", 60) * 60,
+                backoff_config.get("max_delay_hours", 168) * 60 * 60,
+            )
+
+        # Optional index collapsing entries that arrive through several feeds
+        self.dedup = None
+        dedup_config = self.config.get("dedup", {})
+        if dedup_config.get("enabled"):
+            self.dedup = DedupIndex(dedup_config.get("policy", "first"))
+
+        # Content fingerprints of the outputs, used to skip unchanged ones
+        self.output_fingerprints_file = os.path.join(
+            os.path.dirname(last_run_file), "output_fingerprints.json"
+        )
+        self.previous_fingerprints = load_json_file(self.output_fingerprints_file, {})
+        self.output_fingerprints = {}
+        self.outputs_changed = False
+
+        # Views shared by the output generators, built once per run
+        self.sorted_feeds = None
+        self.entries_by_feed = None
+
+        # Optional SQLite store that keeps entries from previous runs
+        self.entry_store = None
+        store_config = self.config.get("entry_store", {})
+        if store_config.get("enabled"):
+            self.entry_store = EntryStore(store_config.get("path", "entries.db"))
+
+        # Optional RFC 5005 archive of the entries that leave the merged feed
+        self.rss_archive = None
+        archive_config = self.config.get("rss_archive", {})
+        if archive_config.get("enabled"):
+            self.rss_archive = RSSArchive(
+                os.path.join(os.path.dirname(last_run_file), "rss_archive.json"),
+                archive_config.get("page_size", self.config["max_entries"]["rss"]),
+            )
+
         # Setup Jinja2 environment
         template_dir = Path(__file__).parent.parent / "templates"
         self.jinja_env = Environment(
@@ -91,27 +314,8 @@ class RSSHub:
             return feeds
 
         try:
-            with open(self.opml_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            root = ET.fromstring(content)
-
-            # Find all outline elements with xmlUrl attribute
-            for outline in root.findall(".//outline[@xmlUrl]"):
-                feed_url = outline.get("xmlUrl")
-                title = outline.get("title") or outline.get("text", "Unknown Feed")
-                category = outline.get("category", "")
-
-                if validate_url(feed_url):
-                    feeds.append(
-                        {
-                            "title": title.strip(),
-                            "url": feed_url.strip(),
-                            "category": category.strip(),
-                        }
-                    )
-                else:
-                    print(f"⚠️  Skipping invalid URL: {feed_url}")
+            for feed in self.iter_opml():
+                feeds.append(feed)
 
         except ET.ParseError as e:
             print(f"❌ Error parsing OPML: {e}")
@@ -120,6 +324,62 @@ class RSSHub:
 
         return feeds
 
+    def iter_opml(self) -> Iterator[Dict[str, str]]:
+        """
+        Stream feed records from the OPML file with bounded memory.
+
+        Feeds without a category attribute inherit the title of the closest
+        enclosing outline, and each feed URL is yielded only once.
+
+        Yields:
+            Feed dictionaries with title, url and category
+        """
+        seen_urls = set()
+        # Open elements and the category names of the open outlines
+        open_elements = []
+        categories = []
+
+        for event, element in ET.iterparse(self.opml_file, events=("start", "end")):
+            if event == "end":
+                open_elements.pop()
+                if element.tag == "outline":
+                    categories.pop()
+                # Detach finished elements so the tree never grows past its depth
+                if open_elements:
+                    open_elements[-1].remove(element)
+                continue
+
+            open_elements.append(element)
+            if element.tag != "outline":
+                continue
+
+            feed_url = element.get("xmlUrl")
+            if feed_url is None:
+                # A folder outline names the category of the feeds inside it
+                categories.append(
+                    (element.get("title") or element.get("text") or "").strip()
+                )
+                continue
+            categories.append("")
+
+            title = element.get("title") or element.get("text", "Unknown Feed")
+            category = element.get("category") or next(
+                (name for name in reversed(categories) if name), ""
+            )
+            feed_url = feed_url.strip()
+
+            if not validate_url(feed_url):
+                print(f"⚠️  Skipping invalid URL: {feed_url}")
+            elif feed_url in seen_urls:
+                print(f"⚠️  Skipping duplicate feed: {feed_url}")
+            else:
+                seen_urls.add(feed_url)
+                yield {
+                    "title": title.strip(),
+                    "url": feed_url,
+                    "category": category.strip(),
+                }
+
     def fetch_feed(
         self, feed_info: Dict[str, str]
     ) -> Optional[feedparser.FeedParserDict]:
@@ -136,25 +396,230 @@ class RSSHub:
 
         print(f"📡 Fetching: {feed_info['title']}")
 
-        response = fetch_with_retry(feed_url)
+        stats = self.feed_stats.setdefault(
+            feed_url, {"title": feed_info["title"], "url": feed_url}
+        )
+
+        if self.deadline.expired():
+            stats["abandoned"] = True
+            return None
+
+        # Skip feeds that are quarantined or backing off after failures
+        if self.failures and self.failures.is_blocked(feed_url):
+            failure = self.failures.feeds[feed_url]
+            state = "Quarantined" if failure.get("quarantined") else "Backing off"
+            print(
+                f"⏸️  {state}: {feed_info['title']} "
+                f"({failure['failures']} failures, last error: {failure['last_error']})"
+            )
+            stats["backed_off"] = True
+            return None
+
+        cached = self.feed_cache.get(feed_url)
+
+        # Reuse the previous result for feeds the schedule says are not due
+        if self.schedule and cached and not self.schedule.is_due(feed_url):
+            print(f"⏭️  Not due: {feed_info['title']}")
+            parsed = feed_from_cache(cached["parsed"])
+            stats["not_due"] = True
+            stats["entry_count"] = len(parsed.entries)
+            return parsed
+
+        # Send validators from the previous run so unchanged feeds return 304
+        conditional_headers = {}
+        if cached:
+            if cached.get("etag"):
+                conditional_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = fetch_with_retry(
+            feed_url,
+            extra_headers=conditional_headers,
+            stats=stats,
+            policy=self.retry_policy,
+            deadline=self.deadline,
+            max_bytes=self.max_bytes,
+        )
         if not response:
+            # Feeds cut off by the run deadline have not failed
+            if not stats.get("abandoned"):
+                self.record_failure(feed_url, stats.get("error"), stats.get("status"))
             return None
 
-        try:
-            parsed = feedparser.parse(response.content)
+        if response.status_code == 304 and cached:
+            print(f"♻️  Not modified: {feed_info['title']}")
+            parsed = feed_from_cache(cached["parsed"])
+            stats["entry_count"] = len(parsed.entries)
+            self.record_schedule(feed_url, parsed)
+            if self.failures:
+                self.failures.record_success(feed_url)
+            return parsed
 
-            if parsed.bozo and parsed.bozo_exception:
-                print(f"⚠️  Feed {feed_url} has parsing issues: {parsed.bozo_exception}")
+        try:
+            # Parse in a worker process when there is a pool, so parsing
+            # runs on every core while this thread only waits
+            parse_start = time.perf_counter()
+            if self.parse_pool:
+                record, warning = self.parse_pool.submit(
+                    parse_feed_content, response.content
+                ).result()
+            else:
+                record, warning = parse_feed_content(response.content)
+            parsed = feed_from_cache(record)
+            stats["parse_time"] = round(time.perf_counter() - parse_start, 4)
+            stats["entry_count"] = len(parsed.entries)
+
+            if warning:
+                print(f"⚠️  Feed {feed_url} has parsing issues: {warning}")
 
             if not parsed.entries:
                 print(f"⚠️  No entries found in {feed_url}")
 
+            # Scheduled feeds are always cached so skipped runs can reuse them
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified or self.schedule:
+                self.feed_cache[feed_url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "parsed": record,
+                }
+            self.record_schedule(feed_url, parsed)
+            if self.failures:
+                self.failures.record_success(feed_url)
+
             return parsed
 
         except Exception as e:
             print(f"❌ Error parsing feed {feed_url}: {e}")
+            self.record_failure(feed_url, str(e))
             return None
 
+    def record_failure(
+        self, feed_url: str, error: Optional[str], status: Optional[int] = None
+    ):
+        """
+        Count a failed fetch so the feed backs off in later runs.
+
+        Args:
+            feed_url: Feed URL
+            error: Error message
+            status: HTTP status code, if the server answered
+        """
+        if self.failures:
+            failure = self.failures.record_failure(feed_url, error, status)
+            if failure.get("quarantined"):
+                print(f"🚫 Quarantined {feed_url} (HTTP {status})")
+
+    def record_schedule(self, feed_url: str, parsed: feedparser.FeedParserDict):
+        """
+        Update the polling schedule after a feed was fetched.
+
+        Args:
+            feed_url: Feed URL
+            parsed: Parsed feed data
+        """
+        if self.schedule:
+            self.schedule.record_fetch(
+                feed_url, [entry_timestamp(entry) for entry in parsed.entries]
+            )
+
+    def fetch_feed_with_favicon(
+        self, feed_info: Dict[str, str]
+    ) -> Tuple[Optional[feedparser.FeedParserDict], Optional[str]]:
+        """
+        Fetch a feed and resolve its favicon; safe to run in a worker thread.
+
+        Args:
+            feed_info: Dictionary with feed information
+
+        Returns:
+            Tuple of parsed feed data (or None) and favicon URL (or None)
+        """
+        parsed_feed = self.fetch_feed(feed_info)
+        favicon_url = None
+
+        if parsed_feed and parsed_feed.entries:
+            favicon_start = time.perf_counter()
+            feed_link = safe_get_text(parsed_feed.feed, "link")
+            favicon_config = self.config.get("favicon", {})
+            time_budget = favicon_config.get("time_budget_seconds", 8)
+            if self.deadline.remaining() is not None:
+                time_budget = min(time_budget, self.deadline.remaining())
+            favicon_url = get_favicon_url(
+                feed_info["url"],
+                feed_link,
+                cache=self.favicon_cache,
+                cache_ttl=favicon_config.get("cache_ttl_hours", 168) * 60 * 60,
+                force_refresh=favicon_config.get("force_refresh", False),
+                time_budget=time_budget,
+            )
+            if feed_info["url"] in self.feed_stats:
+                self.feed_stats[feed_info["url"]]["favicon_time"] = round(
+                    time.perf_counter() - favicon_start, 4
+                )
+
+        return parsed_feed, favicon_url
+
+    def add_feed_result(
+        self,
+        feed_info: Dict[str, str],
+        parsed_feed: Optional[feedparser.FeedParserDict],
+        favicon_url: Optional[str],
+    ):
+        """
+        Collect entries and metadata from a fetched feed.
+
+        Args:
+            feed_info: Dictionary with feed information
+            parsed_feed: Parsed feed data or None if the fetch failed
+            favicon_url: Resolved favicon URL for the feed
+        """
+        if not parsed_feed or not parsed_feed.entries:
+            return
+
+        feed_link = safe_get_text(parsed_feed.feed, "link")
+
+        # Keep compact entries with the feed metadata attached, so the parsed
+        # feed can be released
+        entries = [
+            Entry.from_parsed(entry, feed_info, favicon_url)
+            for entry in parsed_feed.entries
+        ]
+
+        if self.dedup:
+            self.dedup.extend(entries)
+        else:
+            self.all_entries.extend(entries)
+
+        # Find the most recent entry date for this feed
+        latest_entry_date = None
+        latest_entry_ts = 0
+
+        if entries:
+            latest_entry = max(entries, key=entry_sort_key)
+            latest_entry_date = safe_get_text(latest_entry, "published")
+            latest_entry_ts = entry_timestamp(latest_entry)
+
+        # Store feed metadata
+        feed_meta = {
+            "title": feed_info["title"],
+            "url": feed_info["url"],
+            "category": feed_info.get("category", ""),
+            "link": feed_link,
+            "description": safe_get_text(parsed_feed.feed, "description"),
+            "updated": safe_get_text(parsed_feed.feed, "updated"),
+            "updated_ts": struct_to_epoch(parsed_feed.feed.get("updated_parsed"))
+            or parse_date(parsed_feed.feed.get("updated")),
+            "latest_post_date": latest_entry_date,  # Most recent post date
+            "latest_post_ts": latest_entry_ts,  # UTC epoch for sorting
+            "entry_count": len(entries),
+            "language": safe_get_text(parsed_feed.feed, "language", "en"),
+            "favicon_url": favicon_url,  # Add favicon URL
+        }
+        self.feeds_with_updates.append(feed_meta)
+
     def process_feeds(self):
         """Process all feeds and collect entries."""
         self.feeds = self.parse_opml()
@@ -165,240 +630,393 @@ class RSSHub:
 
         print(f"📚 Found {len(self.feeds)} feeds")
 
-        for feed_info in self.feeds:
-            parsed_feed = self.fetch_feed(feed_info)
-
-            if parsed_feed and parsed_feed.entries:
-                # Get favicon URL first
-                feed_link = safe_get_text(parsed_feed.feed, "link")
-                favicon_url = get_favicon_url(feed_info["url"], feed_link)
-
-                # Process entries
-                for entry in parsed_feed.entries:
-                    # Add feed metadata to each entry
-                    entry["feed_title"] = feed_info["title"]
-                    entry["feed_url"] = feed_info["url"]
-                    entry["feed_category"] = feed_info.get("category", "")
-                    entry["feed_favicon_url"] = favicon_url
-
-                self.all_entries.extend(parsed_feed.entries)
-
-                # Find the most recent entry date for this feed
-                latest_entry_date = None
-                latest_entry_parsed = None
-
-                if parsed_feed.entries:
-                    # Sort entries by publication date to find the latest
-                    sorted_entries = sorted(
-                        parsed_feed.entries,
-                        key=lambda x: x.get("published_parsed") or (0,),
-                        reverse=True,
-                    )
-                    if sorted_entries:
-                        latest_entry = sorted_entries[0]
-                        latest_entry_date = safe_get_text(latest_entry, "published")
-                        latest_entry_parsed = latest_entry.get("published_parsed")
-
-                # Store feed metadata
-                feed_meta = {
-                    "title": feed_info["title"],
-                    "url": feed_info["url"],
-                    "category": feed_info.get("category", ""),
-                    "link": feed_link,
-                    "description": safe_get_text(parsed_feed.feed, "description"),
-                    "updated": safe_get_text(parsed_feed.feed, "updated"),
-                    "updated_parsed": parsed_feed.feed.get("updated_parsed"),
-                    "latest_post_date": latest_entry_date,  # Most recent post date
-                    "latest_post_parsed": latest_entry_parsed,  # Parsed version for sorting
-                    "entry_count": len(parsed_feed.entries),
-                    "language": safe_get_text(parsed_feed.feed, "language", "en"),
-                    "favicon_url": favicon_url,  # Add favicon URL
-                }
-                self.feeds_with_updates.append(feed_meta)
+        fetch_config = self.config.get("fetch", {})
+        max_workers = fetch_config.get("max_workers", 8)
+        self.deadline = Deadline(fetch_config.get("run_deadline_seconds"))
+
+        # 0 or unset runs one parse process per CPU core
+        parse_workers = fetch_config.get("parse_workers") or os.cpu_count() or 1
+        if parse_workers > 1:
+            self.parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+            # Start the worker processes before any fetch thread exists
+            self.parse_pool.submit(int).result()
+        try:
+            self.fetch_all(max_workers)
+        finally:
+            if self.parse_pool:
+                self.parse_pool.shutdown()
+                self.parse_pool = None
+
+        if self.dedup:
+            self.all_entries = self.dedup.entries
+            if self.entry_store:
+                self.all_entries = self.drop_stored_copies(self.all_entries)
+            if self.dedup.removed:
+                print(f"🔁 Removed {len(self.dedup.removed)} duplicate entries")
+
+        if self.entry_store:
+            self.entry_store.upsert_entries(
+                self.all_entries, entry_keys if self.dedup else None
+            )
+            if self.dedup and self.dedup.removed:
+                # Drop copies stored by earlier runs, but never a kept entry
+                # that shares its key with a removed copy
+                kept = {entry_key(entry) for entry in self.all_entries}
+                self.entry_store.remove(
+                    {entry_key(entry) for entry in self.dedup.removed} - kept
+                )
+            # Prune before the pages are built, so they never show entries
+            # of unsubscribed feeds or entries past the retention period
+            self.entry_store.prune(
+                {feed["url"] for feed in self.feeds},
+                self.config.get("entry_store", {}).get("retention_days"),
+            )
 
         if not self.all_entries:
             print("❌ No entries found in any feeds")
             sys.exit(1)
 
+        # Entries changed, so the shared views must be rebuilt
+        self.sorted_feeds = None
+
         print(f"📰 Total entries collected: {len(self.all_entries)}")
 
+    def drop_stored_copies(self, entries: list) -> list:
+        """
+        Collapse entries with copies from other feeds stored by earlier runs.
+
+        A planet may still carry a post after the author's blog dropped it,
+        so its copy only shows up in a later run. Stored copies count as
+        seen first; the dedup policy decides which copy is kept, and the
+        losers are added to the dedup index's removed entries.
+
+        Args:
+            entries: This run's deduplicated entries
+
+        Returns:
+            The entries without the ones that lost to a stored copy
+        """
+        run_keys = {entry_key(entry) for entry in entries}
+        stored = [
+            entry
+            for entry in self.entry_store.find_copies(
+                {key for entry in entries for key in entry_keys(entry)}
+            )
+            if entry_key(entry) not in run_keys
+        ]
+        if not stored:
+            return entries
+
+        index = DedupIndex(self.dedup.policy)
+        index.extend(stored)
+        index.extend(entries)
+        self.dedup.removed.extend(index.removed)
+        stored_keys = {entry_key(entry) for entry in stored}
+        return [entry for entry in index.entries if entry_key(entry) not in stored_keys]
+
+    def fetch_all(self, max_workers: int):
+        """
+        Fetch every feed and collect the results, stopping at the run deadline.
+
+        Args:
+            max_workers: Number of fetch threads; 1 fetches serially
+        """
+        if max_workers > 1:
+            # Results are collected in submission order, so the collected
+            # entries are identical to the serial path
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = [
+                executor.submit(self.fetch_feed_with_favicon, feed_info)
+                for feed_info in self.feeds
+            ]
+            try:
+                for index, (feed_info, future) in enumerate(zip(self.feeds, futures)):
+                    try:
+                        parsed_feed, favicon_url = future.result(
+                            timeout=self.deadline.remaining()
+                        )
+                    except FutureTimeoutError:
+                        # Keep the later fetches that already finished, still
+                        # in OPML order, and only abandon the unfinished ones
+                        pending = []
+                        for feed_info, future in zip(
+                            self.feeds[index:], futures[index:]
+                        ):
+                            if future.done():
+                                self.add_feed_result(feed_info, *future.result())
+                            else:
+                                pending.append(feed_info)
+                        self.abandon_feeds(pending)
+                        break
+                    self.add_feed_result(feed_info, parsed_feed, favicon_url)
+            finally:
+                # Running fetches stop at the deadline on their own
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+        else:
+            for index, feed_info in enumerate(self.feeds):
+                if self.deadline.expired():
+                    self.abandon_feeds(self.feeds[index:])
+                    break
+                parsed_feed, favicon_url = self.fetch_feed_with_favicon(feed_info)
+                self.add_feed_result(feed_info, parsed_feed, favicon_url)
+
+    def abandon_feeds(self, feeds: List[Dict[str, str]]):
+        """
+        Give up on feeds not fetched before the run deadline.
+
+        Args:
+            feeds: Feeds whose results are not collected
+        """
+        print(f"⌛ Run deadline reached, abandoning {len(feeds)} pending feeds")
+        for feed_info in feeds:
+            stats = self.feed_stats.setdefault(
+                feed_info["url"], {"title": feed_info["title"], "url": feed_info["url"]}
+            )
+            stats["abandoned"] = True
+
+    def build_views(self) -> Tuple[List[dict], Dict[str, list]]:
+        """
+        Build the views shared by the output generators once per run.
+
+        Returns:
+            Feeds sorted by most recent update, and entries grouped by feed URL
+        """
+        if self.sorted_feeds is None:
+            self.sorted_feeds = sorted(
+                self.feeds_with_updates, key=feed_sort_key, reverse=True
+            )
+            self.entries_by_feed = {}
+            for entry in self.all_entries:
+                self.entries_by_feed.setdefault(entry.get("feed_url"), []).append(entry)
+
+        return self.sorted_feeds, self.entries_by_feed
+
     def generate_latest_rss(self):
         """Generate merged RSS file with latest entries."""
         output_file = self.config["output_files"]["rss"]
         max_entries = self.config["max_entries"]["rss"]
+        links = [("self", f"./{output_file}")]
+
+        if self.rss_archive:
+            latest_entries = self.archive_rss_entries()
+            if self.rss_archive.latest_page:
+                archive_dir = self.config["output_files"].get("archive_dir", "archive")
+                links.append(
+                    ("prev-archive", f"./{archive_dir}/{self.rss_archive.latest_page}")
+                )
+        elif self.entry_store:
+            latest_entries = self.entry_store.latest(max_entries)
+        else:
+            # Select the newest entries without sorting the whole list
+            latest_entries = heapq.nlargest(
+                max_entries, self.all_entries, key=entry_sort_key
+            )
 
-        # Sort entries by publication date (newest first)
-        sorted_entries = sorted(
-            self.all_entries,
-            key=lambda x: x.get("published_parsed") or (0,),
-            reverse=True,
-        )
+        if self.output_unchanged(
+            output_file, [entry.copy() for entry in latest_entries], links
+        ):
+            keep_clean_html(safe_get_text(entry, "summary") for entry in latest_entries)
+            return
 
-        latest_entries = sorted_entries[:max_entries]
+        with atomic_write(output_file, errors="xmlcharrefreplace") as f:
+            self.write_rss_page(f, latest_entries, links)
 
-        # Create RSS XML
-        rss = ET.Element("rss", version="2.0")
-        rss.set("xmlns:atom", "http://www.w3.org/2005/Atom")
+        print(f"✅ Generated {output_file} with {len(latest_entries)} entries")
 
-        channel = ET.SubElement(rss, "channel")
+    def archive_rss_entries(self) -> list:
+        """
+        Move the entries that overflow the merged feed into archive pages.
 
-        ET.SubElement(channel, "title").text = self.config["site_title"]
-        ET.SubElement(channel, "description").text = self.config["site_description"]
-        ET.SubElement(channel, "link").text = self.config["site_link"]
-        ET.SubElement(channel, "lastBuildDate").text = get_readable_timestamp()
-        ET.SubElement(channel, "generator").text = self.config["generator"]
+        Archive pages are named after a hash of their content and link to
+        the previous page, so they can be cached forever and are never
+        rewritten; only the current page changes between runs. Without the
+        entry store, only this run's entries reach the archive.
 
-        # Add atom:link for self-reference
-        atom_link = ET.SubElement(channel, "{http://www.w3.org/2005/Atom}link")
-        atom_link.set("href", f"./{output_file}")
-        atom_link.set("rel", "self")
-        atom_link.set("type", "application/rss+xml")
+        Returns:
+            Entries of the current page, newest first
+        """
+        output_file = self.config["output_files"]["rss"]
+        archive_dir = self.config["output_files"].get("archive_dir", "archive")
 
-        for entry in latest_entries:
-            item = ET.SubElement(channel, "item")
-            ET.SubElement(item, "title").text = safe_get_text(
-                entry, "title", "No Title"
-            )
-            ET.SubElement(item, "link").text = safe_get_text(entry, "link")
-            ET.SubElement(item, "description").text = clean_html(
-                safe_get_text(entry, "summary")
+        if self.entry_store:
+            candidates = self.entry_store.entries_after(self.rss_archive.cutoff)
+        else:
+            candidates = self.all_entries
+        current, pages = self.rss_archive.split(candidates)
+
+        for entries in pages:
+            links = [("current", os.path.relpath(output_file, archive_dir))]
+            if self.rss_archive.latest_page:
+                links.append(("prev-archive", f"./{self.rss_archive.latest_page}"))
+            buffer = io.StringIO()
+            self.write_rss_page(buffer, entries, links, archive=True)
+            content = buffer.getvalue()
+
+            file_name = archive_page_name(content)
+            os.makedirs(archive_dir, exist_ok=True)
+            with atomic_write(
+                os.path.join(archive_dir, file_name), errors="xmlcharrefreplace"
+            ) as f:
+                f.write(content)
+            self.rss_archive.add_page(file_name, entries)
+            print(f"🗄️  Archived {len(entries)} entries to {archive_dir}/{file_name}")
+
+        return current
+
+    def write_rss_page(
+        self, f, entries: list, links: List[Tuple[str, str]], archive: bool = False
+    ):
+        """
+        Write an RSS 2.0 document of merged entries.
+
+        Args:
+            f: Text file to write to
+            entries: Entries, newest first
+            links: (rel, href) pairs written as atom:link elements
+            archive: Mark the document as an RFC 5005 archive page, which
+                carries no build date so its content never changes
+        """
+        writer = XMLStreamWriter(f)
+        # The atom namespace is declared twice (ns0 and atom) to match the
+        # output of the ElementTree version of this generator
+        attrib = [
+            ("xmlns:ns0", ATOM_NAMESPACE),
+            ("version", "2.0"),
+            ("xmlns:atom", ATOM_NAMESPACE),
+        ]
+        if archive:
+            attrib.append(("xmlns:fh", HISTORY_NAMESPACE))
+        writer.start("rss", attrib)
+        writer.start("channel")
+
+        writer.element("title", self.config["site_title"])
+        writer.element("description", self.config["site_description"])
+        writer.element("link", self.config["site_link"])
+        if not archive:
+            writer.element("lastBuildDate", get_readable_timestamp())
+        writer.element("generator", self.config["generator"])
+
+        for rel, href in links:
+            writer.element(
+                "ns0:link",
+                attrib=[("href", href), ("rel", rel), ("type", "application/rss+xml")],
             )
+        if archive:
+            writer.element("fh:archive")
+
+        for entry in entries:
+            writer.start("item")
+            writer.element("title", safe_get_text(entry, "title", "No Title"))
+            writer.element("link", safe_get_text(entry, "link"))
+            writer.element("description", clean_html(safe_get_text(entry, "summary")))
 
             if entry.get("published"):
-                ET.SubElement(item, "pubDate").text = entry["published"]
+                writer.element("pubDate", entry["published"])
 
             # Add GUID
-            guid = ET.SubElement(item, "guid")
-            guid.text = safe_get_text(entry, "link") or safe_get_text(
-                entry, "id", "no-guid"
+            writer.element(
+                "guid",
+                safe_get_text(entry, "link") or safe_get_text(entry, "id", "no-guid"),
+                [("isPermaLink", "true" if entry.get("link") else "false")],
             )
-            guid.set("isPermaLink", "true" if entry.get("link") else "false")
 
             # Add source feed info
-            source = ET.SubElement(item, "source")
-            source.text = entry.get("feed_title", "Unknown Feed")
-            source.set("url", entry.get("feed_url", ""))
+            writer.element(
+                "source",
+                entry.get("feed_title", "Unknown Feed"),
+                [("url", entry.get("feed_url", ""))],
+            )
+            writer.end()
 
-        # Write to file
-        tree = ET.ElementTree(rss)
-        ET.indent(tree, space="  ", level=0)
-        tree.write(output_file, encoding="utf-8", xml_declaration=True)
-        print(f"✅ Generated {output_file} with {len(latest_entries)} entries")
+        writer.end()
+        writer.end()
 
     def generate_latest_feeds(self):
         """Generate RSS 2.0 XML file with feeds sorted by recent updates."""
         output_file = self.config["output_files"]["feeds"]
 
-        # Sort feeds by latest post date (more reliable than feed updated field)
-        sorted_feeds = sorted(
-            self.feeds_with_updates,
-            key=lambda x: x.get("latest_post_parsed")
-            or x.get("updated_parsed")
-            or (0,),
-            reverse=True,
-        )
+        # Feeds sorted by latest post date (more reliable than feed updated field)
+        sorted_feeds = self.build_views()[0]
 
-        # Create RSS 2.0 XML structure
-        rss_root = ET.Element("rss")
-        rss_root.set("version", "2.0")
-        rss_root.set("xmlns:atom", "http://www.w3.org/2005/Atom")
-
-        channel = ET.SubElement(rss_root, "channel")
-
-        # Channel metadata
-        ET.SubElement(channel, "title").text = "LovelyRSS - Subscribed Feeds"
-        ET.SubElement(
-            channel, "description"
-        ).text = f"List of {len(sorted_feeds)} RSS feeds subscribed to in LovelyRSS, sorted by latest updates"
-        ET.SubElement(
-            channel, "link"
-        ).text = "https://github.com/pesarkhobeee/lovelyRSS"
-        ET.SubElement(channel, "lastBuildDate").text = get_current_timestamp()
-        ET.SubElement(channel, "generator").text = "LovelyRSS"
-        ET.SubElement(channel, "language").text = "en"
-
-        # Add atom:link for self-reference
-        atom_link = ET.SubElement(channel, "atom:link")
-        atom_link.set("href", output_file.split("/")[-1])
-        atom_link.set("rel", "self")
-        atom_link.set("type", "application/rss+xml")
-
-        # Add each feed as an RSS item
-        for feed in sorted_feeds:
-            item = ET.SubElement(channel, "item")
-
-            # Required RSS item elements
-            ET.SubElement(item, "title").text = feed.get("title", "Unknown Feed")
-            ET.SubElement(item, "link").text = feed.get("link", "")
-            ET.SubElement(item, "description").text = (
-                f"RSS Feed: {feed.get('description', 'No description')} | "
-                f"Category: {feed.get('category', 'Uncategorized')} | "
-                f"Posts: {feed.get('entry_count', 0)} | "
-                f"Language: {feed.get('language', 'en')}"
+        if self.output_unchanged(output_file, sorted_feeds):
+            return
+
+        with atomic_write(output_file, errors="xmlcharrefreplace") as f:
+            writer = XMLStreamWriter(f)
+            writer.start("rss", [("version", "2.0"), ("xmlns:atom", ATOM_NAMESPACE)])
+            writer.start("channel")
+
+            # Channel metadata
+            writer.element("title", "LovelyRSS - Subscribed Feeds")
+            writer.element(
+                "description",
+                f"List of {len(sorted_feeds)} RSS feeds subscribed to in LovelyRSS, sorted by latest updates",
+            )
+            writer.element("link", "https://github.com/pesarkhobeee/lovelyRSS")
+            writer.element("lastBuildDate", get_current_timestamp())
+            writer.element("generator", "LovelyRSS")
+            writer.element("language", "en")
+
+            # Add atom:link for self-reference
+            writer.element(
+                "atom:link",
+                attrib=[
+                    ("href", output_file.split("/")[-1]),
+                    ("rel", "self"),
+                    ("type", "application/rss+xml"),
+                ],
             )
 
-            # Optional elements
-            ET.SubElement(item, "pubDate").text = feed.get("updated", "")
-            ET.SubElement(item, "guid").text = feed.get("url", "")
+            # Add each feed as an RSS item
+            for feed in sorted_feeds:
+                writer.start("item")
 
-            # Custom elements for feed metadata
-            ET.SubElement(item, "category").text = feed.get("category", "Uncategorized")
+                # Required RSS item elements
+                writer.element("title", feed.get("title", "Unknown Feed"))
+                writer.element("link", feed.get("link", ""))
+                writer.element(
+                    "description",
+                    f"RSS Feed: {feed.get('description', 'No description')} | "
+                    f"Category: {feed.get('category', 'Uncategorized')} | "
+                    f"Posts: {feed.get('entry_count', 0)} | "
+                    f"Language: {feed.get('language', 'en')}",
+                )
 
-        # Write to file
-        tree = ET.ElementTree(rss_root)
-        ET.indent(tree, space="  ", level=0)
-        tree.write(output_file, encoding="utf-8", xml_declaration=True)
-        print(f"✅ Generated RSS 2.0 {output_file} with {len(sorted_feeds)} feeds")
+                # Optional elements
+                writer.element("pubDate", feed.get("updated", ""))
+                writer.element("guid", feed.get("url", ""))
 
-    def generate_site_data(self) -> dict:
-        """Generate a dictionary with all data needed for the HTML page."""
+                # Custom elements for feed metadata
+                writer.element("category", feed.get("category", "Uncategorized"))
+                writer.end()
 
-        import time
-        from datetime import datetime, timezone
+            writer.end()
+            writer.end()
 
-        def serialize_parsed_time(parsed_time):
-            if not parsed_time:
-                return None
-            return datetime.fromtimestamp(time.mktime(parsed_time)).isoformat()
+        print(f"✅ Generated RSS 2.0 {output_file} with {len(sorted_feeds)} feeds")
 
-        # Sort entries by date
-        sorted_entries = sorted(
-            self.all_entries,
-            key=lambda x: x.get("published_parsed") or (0,),
-            reverse=True,
-        )
+    def generate_site_data(self) -> dict:
+        """Generate a dictionary with all data needed for the HTML page."""
 
-        # Sort feeds by update time (using latest post date)
-        sorted_feeds = sorted(
-            self.feeds_with_updates,
-            key=lambda x: x.get("latest_post_parsed")
-            or x.get("updated_parsed")
-            or (0,),
-            reverse=True,
-        )
+        # Feeds sorted by update time (using latest post date)
+        sorted_feeds, entries_by_feed = self.build_views()
 
         # Mark feeds with recent updates (last 24 hours)
-        now = datetime.now(timezone.utc)
-        one_day_ago = now.timestamp() - (24 * 60 * 60)
+        one_day_ago = int(time.time()) - 24 * 60 * 60
 
         feeds_data = []
         for feed in sorted_feeds:
             feed_copy = feed.copy()
-            has_recent_update = False
-            if feed.get("latest_post_parsed"):
-                post_timestamp = time.mktime(feed["latest_post_parsed"])
-                has_recent_update = post_timestamp > one_day_ago
-
-            feed_copy["latest_post_parsed"] = serialize_parsed_time(
-                feed.get("latest_post_parsed")
-            )
-            feed_copy["updated_parsed"] = serialize_parsed_time(
-                feed.get("updated_parsed")
-            )
-            feed_copy["has_recent_update"] = has_recent_update
+            latest_post_ts = feed.get("latest_post_ts", 0)
+            feed_copy["latest_post_parsed"] = epoch_to_iso(latest_post_ts)
+            feed_copy["updated_parsed"] = epoch_to_iso(feed.get("updated_ts", 0))
+            feed_copy["has_recent_update"] = latest_post_ts > one_day_ago
             feeds_data.append(feed_copy)
 
-        # Group feeds by category and sort within each category
+        # Group feeds by category; feeds_data is already sorted by most recent
+        # updates, so each category keeps that order
         categories_data = {}
         for feed in feeds_data:
             category = feed.get("category") or "Uncategorized"
@@ -406,36 +1024,29 @@ class RSSHub:
                 categories_data[category] = []
             categories_data[category].append(feed)
 
-        # Sort feeds within each category by most recent updates
-        for category in categories_data:
-            categories_data[category] = sorted(
-                categories_data[category],
-                key=lambda x: x.get("latest_post_parsed")
-                or x.get("updated_parsed")
-                or "0",
-                reverse=True,
-            )
-
         # Group entries by feed URL for easy access
         entries_by_feed_data = {}
-        for entry in self.all_entries:
-            feed_url = entry.get("feed_url")
-            if feed_url not in entries_by_feed_data:
+        if self.entry_store:
+            for feed in sorted_feeds:
+                entries_by_feed_data[feed["url"]] = []
+                for entry in self.entry_store.latest_for_feed(feed["url"], 10):
+                    entry_copy = entry.copy()
+                    entry_copy["published_parsed"] = epoch_to_iso(
+                        entry_timestamp(entry)
+                    )
+                    entries_by_feed_data[feed["url"]].append(entry_copy)
+            total_entries = self.entry_store.count()
+        else:
+            # Copy only the 10 latest entries of each feed
+            for feed_url, feed_entries in entries_by_feed.items():
                 entries_by_feed_data[feed_url] = []
-
-            entry_copy = entry.copy()
-            entry_copy["published_parsed"] = serialize_parsed_time(
-                entry.get("published_parsed")
-            )
-            entries_by_feed_data[feed_url].append(entry_copy)
-
-        # Sort entries within each feed and limit to 10 latest
-        for feed_url in entries_by_feed_data:
-            entries_by_feed_data[feed_url] = sorted(
-                entries_by_feed_data[feed_url],
-                key=lambda x: x.get("published_parsed") or "0",
-                reverse=True,
-            )[:10]
+                for entry in heapq.nlargest(10, feed_entries, key=entry_sort_key):
+                    entry_copy = entry.copy()
+                    entry_copy["published_parsed"] = epoch_to_iso(
+                        entry_timestamp(entry)
+                    )
+                    entries_by_feed_data[feed_url].append(entry_copy)
+            total_entries = len(self.all_entries)
 
         # Prepare template data
         site_link = self.config.get("site_link", "")
@@ -453,7 +1064,7 @@ class RSSHub:
             "categories": categories_data,
             "entries_by_feed": entries_by_feed_data,
             "total_feeds": len(sorted_feeds),
-            "total_entries": len(self.all_entries),
+            "total_entries": total_entries,
             "updated_time": get_readable_timestamp(),
             "update_interval_hours": self.config.get("update_interval_hours", 6),
             "version": self.version,
@@ -463,25 +1074,379 @@ class RSSHub:
 
         return data
 
+    def save_state(self):
+        """Persist the caches and last run timestamp for the next run."""
+        # Drop cache entries for feeds that are no longer subscribed
+        feed_urls = {feed["url"] for feed in self.feeds}
+        feed_cache = {
+            url: cached for url, cached in self.feed_cache.items() if url in feed_urls
+        }
+        save_json_file(self.feed_cache_file, feed_cache)
+        if self.schedule:
+            self.schedule.save(feed_urls)
+        if self.failures:
+            self.failures.save(feed_urls)
+        if self.rss_archive:
+            self.rss_archive.save()
+
+        # Drop expired favicon results so the cache does not grow forever
+        ttl = self.config.get("favicon", {}).get("cache_ttl_hours", 168) * 60 * 60
+        now = time.time()
+        favicon_cache = {
+            origin: cached
+            for origin, cached in self.favicon_cache.items()
+            if now - cached.get("checked_at", 0) < ttl
+        }
+        save_json_file(self.favicon_cache_file, favicon_cache)
+        save_clean_html_cache(self.clean_html_cache_file)
+        save_json_file(self.output_fingerprints_file, self.output_fingerprints)
+        save_json_file(self.last_run_file, {"last_run": get_current_timestamp()})
+
+    def save_run_report(self, duration: float) -> dict:
+        """
+        Write the per-feed telemetry of this run to the run report.
+
+        Args:
+            duration: Wall time of the run in seconds
+
+        Returns:
+            The run report
+        """
+        feeds = []
+        for feed_info in self.feeds:
+            stats = self.feed_stats.get(feed_info["url"])
+            if stats:
+                stats["total_time"] = round(
+                    stats.get("response_time", 0)
+                    + stats.get("parse_time", 0)
+                    + stats.get("favicon_time", 0),
+                    4,
+                )
+                feeds.append(stats)
+
+        quarantined = []
+        if self.failures:
+            titles = {feed["url"]: feed["title"] for feed in self.feeds}
+            quarantined = [
+                dict(self.failures.feeds[url], title=titles[url], url=url)
+                for url in self.failures.quarantined()
+                if url in titles
+            ]
+
+        report = {
+            "generated": get_current_timestamp(),
+            "duration": round(duration, 2),
+            "feed_count": len(self.feeds),
+            "failed_count": sum(1 for stats in feeds if stats.get("error")),
+            "not_due_count": sum(1 for stats in feeds if stats.get("not_due")),
+            "backed_off_count": sum(1 for stats in feeds if stats.get("backed_off")),
+            "abandoned_count": sum(1 for stats in feeds if stats.get("abandoned")),
+            "duplicate_count": len(self.dedup.removed) if self.dedup else 0,
+            "quarantined": quarantined,
+            "outputs_changed": self.outputs_changed,
+            "bytes": sum(stats.get("bytes", 0) for stats in feeds),
+            "wire_bytes": sum(stats.get("wire_bytes", 0) for stats in feeds),
+            "feeds": feeds,
+        }
+        save_json_file(self.run_report_file, report)
+        return report
+
+    def print_run_summary(self, report: dict):
+        """
+        Print the slowest and largest feeds of the run.
+
+        Args:
+            report: Run report from save_run_report
+        """
+        top_n = self.config.get("report", {}).get("top_n", 5)
+        feeds = report["feeds"]
+
+        if report.get("not_due_count"):
+            print(
+                f"\n⏭️  {report['not_due_count']} feeds not due yet, "
+                "reused their previous results"
+            )
+
+        if report.get("backed_off_count"):
+            print(
+                f"\n⏸️  {report['backed_off_count']} failing feeds skipped "
+                "while backing off"
+            )
+
+        if report.get("abandoned_count"):
+            print(
+                f"\n⌛ {report['abandoned_count']} feeds abandoned at the run deadline"
+            )
+
+        if report.get("quarantined"):
+            print(f"\n🚫 Quarantined feeds (remove them from {self.opml_file}):")
+            for failure in report["quarantined"]:
+                print(
+                    f"   {failure['title']} <{failure['url']}> "
+                    f"HTTP {failure.get('last_status')}: {failure.get('last_error')}"
+                )
+
+        print(f"\n⏱️  Slowest {top_n} feeds:")
+        for stats in heapq.nlargest(top_n, feeds, key=lambda x: x["total_time"]):
+            print(
+                f"   {stats['total_time']:7.2f}s  {stats['title']} "
+                f"(connect {stats.get('connect_time', 0):.2f}s, "
+                f"response {stats.get('response_time', 0):.2f}s, "
+                f"parse {stats.get('parse_time', 0):.2f}s, "
+                f"favicon {stats.get('favicon_time', 0):.2f}s)"
+            )
+
+        print(f"\n📦 Largest {top_n} feeds:")
+        for stats in heapq.nlargest(top_n, feeds, key=lambda x: x.get("bytes", 0)):
+            print(
+                f"   {stats.get('bytes', 0) / 1024:7.1f} KiB  {stats['title']} "
+                f"({stats.get('entry_count', 0)} entries)"
+            )
+
+    def write_site_shards(self, site_data: dict) -> dict:
+        """
+        Split the site data into JSON shards loaded by the page on demand.
+
+        Each feed's entries, each category's feed list and the list of all
+        feeds become content-hashed shards in the data directory. Shards of
+        earlier runs that are no longer referenced are removed.
+
+        Args:
+            site_data: Site data from generate_site_data
+
+        Returns:
+            Small index with the page metadata and the shard file names
+        """
+        data_dir = self.config["output_files"].get("data_dir", "data")
+        os.makedirs(data_dir, exist_ok=True)
+        shards = set()
+
+        def save_shard(prefix, data):
+            file_name = save_json_shard(data_dir, prefix, data)
+            shards.add(file_name)
+            return file_name
+
+        entries_shards = {}
+        for feed in site_data["feeds"]:
+            entries = site_data["entries_by_feed"].get(feed["url"], [])
+            entries_shards[feed["url"]] = save_shard(
+                "entries",
+                [
+                    {
+                        "title": entry.get("title"),
+                        "link": entry.get("link"),
+                        "published_parsed": entry.get("published_parsed"),
+                    }
+                    for entry in entries
+                ],
+            )
+
+        def feed_list(feeds):
+            return [
+                {
+                    "title": feed.get("title"),
+                    "url": feed["url"],
+                    "link": feed.get("link"),
+                    "description": feed.get("description"),
+                    "favicon_url": feed.get("favicon_url"),
+                    "latest_post_parsed": feed.get("latest_post_parsed"),
+                    "has_recent_update": feed.get("has_recent_update", False),
+                    "entries_shard": entries_shards[feed["url"]],
+                }
+                for feed in feeds
+            ]
+
+        categories = [
+            {
+                "name": category,
+                "count": len(feeds),
+                "shard": save_shard("category", feed_list(feeds)),
+            }
+            for category, feeds in site_data["categories"].items()
+        ]
+        all_shard = save_shard("category", feed_list(site_data["feeds"]))
+
+        search_shard = None
+        if self.config.get("search", {}).get("enabled", False):
+            term_shards, document_shards = self.build_search_shards()
+            search_shard = save_shard(
+                "search",
+                {
+                    "prefix_length": PREFIX_LENGTH,
+                    "min_term_length": MIN_TERM_LENGTH,
+                    "docs_per_shard": DOCS_PER_SHARD,
+                    "stopwords": sorted(STOPWORDS),
+                    "terms": {
+                        prefix: save_shard("terms", terms)
+                        for prefix, terms in term_shards.items()
+                    },
+                    "documents": {
+                        str(number): save_shard("docs", documents)
+                        for number, documents in document_shards.items()
+                    },
+                },
+            )
+
+        for file_name in os.listdir(data_dir):
+            # Compressed siblings go with their shard
+            shard = file_name
+            for suffix in COMPRESSED_SUFFIXES:
+                if shard.endswith(suffix):
+                    shard = shard[: -len(suffix)]
+            if shard.endswith(".json") and shard not in shards:
+                os.remove(os.path.join(data_dir, file_name))
+
+        return {
+            "title": site_data["title"],
+            "description": site_data["description"],
+            "total_feeds": site_data["total_feeds"],
+            "total_entries": site_data["total_entries"],
+            "updated_time": site_data["updated_time"],
+            "update_interval_hours": site_data["update_interval_hours"],
+            "version": site_data["version"],
+            "opml_export_url": site_data["opml_export_url"],
+            "ui_settings": site_data["ui_settings"],
+            "data_dir": data_dir,
+            "all_shard": all_shard,
+            "categories": categories,
+            "search_shard": search_shard,
+        }
+
+    def build_search_shards(self) -> tuple:
+        """
+        Build the search index shards.
+
+        With the entry store, only entries added or changed since the last
+        run are tokenized and the index covers every stored entry;
+        otherwise this run's entries are indexed from scratch.
+
+        Returns:
+            Term shards and document shards from build_search_shards
+        """
+        if self.entry_store:
+            indexed = self.entry_store.update_search_index(entry_terms)
+            print(f"🔎 Indexed {indexed} new or changed entries for search")
+            documents = (
+                (doc_id, search_document(entry))
+                for doc_id, entry in self.entry_store.search_documents()
+            )
+            return build_search_shards(self.entry_store.search_postings(), documents)
+
+        # Oldest first, so higher document ids belong to newer entries
+        postings, documents = index_entries(
+            sorted(self.all_entries, key=entry_sort_key)
+        )
+        print(f"🔎 Indexed {len(documents)} entries for search")
+        return build_search_shards(postings, documents)
+
+    def output_unchanged(self, output_file: str, *content) -> bool:
+        """
+        Fingerprint an output's content and check it against the last run.
+
+        The fingerprint covers the content, the configuration and the
+        version, but not the build timestamps, so it only changes when the
+        output would really differ.
+
+        Args:
+            output_file: Output file path
+            *content: JSON-serializable data the output is rendered from
+
+        Returns:
+            True if the content is unchanged and the file exists, so writing
+            it can be skipped
+        """
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [self.version, self.config, content], sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+        self.output_fingerprints[output_file] = fingerprint
+
+        if self.previous_fingerprints.get(output_file) != fingerprint:
+            self.outputs_changed = True
+            return False
+        if not os.path.exists(output_file):
+            return False
+
+        print(f"⏭️  {output_file} unchanged, not rewritten")
+        return True
+
+    def precompress_outputs(self):
+        """Write .gz and .br siblings of the generated files for static servers."""
+        compression_config = self.config.get("compression", {})
+        if not compression_config.get("enabled"):
+            return
+
+        output_files = self.config["output_files"]
+        data_dir = output_files.get("data_dir", "data")
+        paths = [output_files[key] for key in ("html", "rss", "feeds")]
+        if os.path.isdir(data_dir):
+            paths.extend(
+                os.path.join(data_dir, file_name)
+                for file_name in os.listdir(data_dir)
+                if file_name.endswith(".json")
+            )
+        # Archive pages never change, so their siblings are only written once
+        archive_dir = output_files.get("archive_dir", "archive")
+        if self.rss_archive and os.path.isdir(archive_dir):
+            paths.extend(
+                os.path.join(archive_dir, file_name)
+                for file_name in os.listdir(archive_dir)
+                if file_name.endswith(".xml")
+            )
+
+        written = precompress_files(
+            paths,
+            min_size=compression_config.get("min_size_bytes", 1024),
+            use_brotli=compression_config.get("brotli", True),
+        )
+        print(f"✅ Precompressed {len(written)} files")
+
     def generate_html(self, site_data: dict):
-        """Generate HTML page."""
+        """Generate HTML page and the data shards it loads."""
         output_file = self.config["output_files"]["html"]
 
-        # Render template
+        # Render template with the shard index only; the page loads the
+        # shards of the visible tab and the expanded feeds
+        site_index = self.write_site_shards(site_data)
         template = self.jinja_env.get_template("index.html")
-        html_content = template.render(site_data=site_data)
+        with open(template.filename, "r", encoding="utf-8") as f:
+            template_source = f.read()
+        if self.output_unchanged(
+            output_file,
+            {key: value for key, value in site_index.items() if key != "updated_time"},
+            template_source,
+        ):
+            return
+
+        html_content = template.render(site_data=site_index)
 
         # Write to file
-        with open(output_file, "w", encoding="utf-8") as f:
+        with atomic_write(output_file) as f:
             f.write(html_content)
 
         print(f"✅ Generated {output_file}")
 
 
-def main():
-    """Main function to process all feeds."""
+def main() -> int:
+    """
+    Main function to process all feeds.
+
+    Returns:
+        Exit status: 0, or UNCHANGED_EXIT_STATUS with --exit-status when no
+        output changed since the last run
+    """
+    parser = argparse.ArgumentParser(description="lovelyRSS - Personal RSS Hub")
+    parser.add_argument(
+        "--exit-status",
+        action="store_true",
+        help=f"exit with status {UNCHANGED_EXIT_STATUS} if no output changed",
+    )
+    args = parser.parse_args()
+
     print("🌟 lovelyRSS - Personal RSS Hub")
     print("=" * 40)
+    start = time.perf_counter()
 
     # Initialize RSS hub
     hub = RSSHub()
@@ -495,12 +1460,23 @@ def main():
     hub.generate_latest_feeds()
     site_data = hub.generate_site_data()
     hub.generate_html(site_data)
+    hub.precompress_outputs()
+    hub.save_state()
 
     print("\n🎉 All files generated successfully!")
     print(
         f"📊 Summary: {len(hub.feeds_with_updates)} feeds, {len(hub.all_entries)} total entries"
     )
 
+    report = hub.save_run_report(time.perf_counter() - start)
+    hub.print_run_summary(report)
+
+    if not hub.outputs_changed:
+        print("\n🟰 No output changed since the last run")
+        if args.exit_status:
+            return UNCHANGED_EXIT_STATUS
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
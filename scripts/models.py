@@ -0,0 +1,137 @@
+"""
+Compact data model for feed entries
+"""
+
+import time
+from typing import Dict, Optional
+
+from dates import parse_date, struct_to_epoch
+
+
+class Entry:
+    """
+    Feed entry holding only the fields used by the output generators.
+
+    Supports the dictionary-style get(), [] and copy() used by the
+    generators, so entries and plain dictionaries can be handled alike.
+    """
+
+    __slots__ = (
+        "title",
+        "link",
+        "summary",
+        "published",
+        "published_ts",
+        "id",
+        "feed_title",
+        "feed_url",
+        "feed_category",
+        "feed_favicon_url",
+    )
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        link: Optional[str] = None,
+        summary: Optional[str] = None,
+        published: Optional[str] = None,
+        published_ts: int = 0,
+        id: Optional[str] = None,
+        feed_title: Optional[str] = None,
+        feed_url: Optional[str] = None,
+        feed_category: Optional[str] = None,
+        feed_favicon_url: Optional[str] = None,
+    ):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.published_ts = published_ts
+        self.id = id
+        self.feed_title = feed_title
+        self.feed_url = feed_url
+        self.feed_category = feed_category
+        self.feed_favicon_url = feed_favicon_url
+
+    @classmethod
+    def from_parsed(
+        cls, entry: Dict, feed_info: Dict[str, str], favicon_url: Optional[str]
+    ) -> "Entry":
+        """
+        Create an entry from a feedparser entry and its feed's metadata.
+
+        Args:
+            entry: Parsed feed entry
+            feed_info: Dictionary with feed information
+            favicon_url: Resolved favicon URL for the feed
+
+        Returns:
+            Compact entry
+        """
+        return cls(
+            title=entry.get("title"),
+            link=entry.get("link"),
+            summary=entry.get("summary"),
+            published=entry.get("published"),
+            published_ts=entry_timestamp(entry),
+            id=entry.get("id"),
+            feed_title=feed_info["title"],
+            feed_url=feed_info["url"],
+            feed_category=feed_info.get("category", ""),
+            feed_favicon_url=favicon_url,
+        )
+
+    @property
+    def published_parsed(self) -> Optional[time.struct_time]:
+        """Publication time as a UTC struct_time, like feedparser provides."""
+        return time.gmtime(self.published_ts) if self.published_ts else None
+
+    def get(self, key: str, default=None):
+        """Get a field like dict.get; unset fields return default."""
+        value = getattr(self, key, None) if key in ENTRY_KEYS else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def copy(self) -> Dict:
+        """Get the set fields as a plain dictionary."""
+        data = {key: self.get(key) for key in ENTRY_KEYS}
+        return {key: value for key, value in data.items() if value is not None}
+
+    def __repr__(self) -> str:
+        return f"Entry(title={self.title!r}, feed_url={self.feed_url!r})"
+
+
+# Keys readable through Entry.get(), including the derived published_parsed
+ENTRY_KEYS = frozenset(Entry.__slots__) | {"published_parsed"}
+
+
+def entry_timestamp(entry) -> int:
+    """
+    Get an entry's publication time as a UTC epoch.
+
+    Entries without a publication date fall back to their update date, and
+    dates feedparser could not parse are parsed from the raw strings.
+
+    Args:
+        entry: Entry or feedparser entry dictionary
+
+    Returns:
+        Seconds since the epoch, or 0 if the entry has no date
+    """
+    if isinstance(entry, Entry):
+        return entry.published_ts
+
+    return (
+        struct_to_epoch(entry.get("published_parsed"))
+        or struct_to_epoch(entry.get("updated_parsed"))
+        or parse_date(entry.get("published"))
+        or parse_date(entry.get("updated"))
+    )
@@ -0,0 +1,105 @@
+"""
+Precompressed .gz and .br siblings for the generated site files
+"""
+
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional
+    brotli = None
+
+# Suffixes of the compressed siblings
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compress_brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+def precompress_file(
+    path: str, min_size: int = 1024, use_brotli: bool = True
+) -> List[str]:
+    """
+    Write compressed siblings of a file, or remove them if it is too small.
+
+    Siblings that are newer than the file are kept as they are. Siblings of
+    compressors that are not in use, for example .br files once brotli is
+    disabled, are removed so a server never sends stale content.
+
+    Args:
+        path: File to compress
+        min_size: Files smaller than this many bytes are not compressed
+        use_brotli: Also write a .br sibling if the brotli package is installed
+
+    Returns:
+        Paths of the siblings written
+    """
+    compressors = [(".gz", _compress_gzip)]
+    if use_brotli and brotli is not None:
+        compressors.append((".br", _compress_brotli))
+
+    stat = os.stat(path)
+    if stat.st_size < min_size:
+        # Small files are served uncompressed and keep no siblings
+        compressors = []
+    active_suffixes = {suffix for suffix, _ in compressors}
+    for suffix in COMPRESSED_SUFFIXES:
+        if suffix not in active_suffixes and os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    data = None
+    written = []
+    for suffix, compress in compressors:
+        sibling = path + suffix
+        if os.path.exists(sibling) and os.stat(sibling).st_mtime >= stat.st_mtime:
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        # Write next to the file and rename, so a server never reads a
+        # partial sibling
+        temp_path = sibling + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(compress(data))
+        os.replace(temp_path, sibling)
+        written.append(sibling)
+    return written
+
+
+def precompress_files(
+    paths: Iterable[str],
+    min_size: int = 1024,
+    use_brotli: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Write compressed siblings of several files in parallel.
+
+    zlib and brotli release the GIL while compressing, so threads compress
+    several files at once.
+
+    Args:
+        paths: Files to compress; missing files are skipped
+        min_size: Files smaller than this many bytes are not compressed
+        use_brotli: Also write .br siblings if the brotli package is installed
+        max_workers: Number of compression threads (defaults to the CPU count)
+
+    Returns:
+        Paths of the siblings written
+    """
+    paths = [path for path in paths if os.path.isfile(path)]
+    max_workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda path: precompress_file(path, min_size, use_brotli), paths
+        )
+        return [sibling for siblings in results for sibling in siblings]
@@ -0,0 +1,117 @@
+"""
+Retry policy and run-wide deadline for feed requests
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+# Statuses worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Transport errors worth retrying; SSL errors are excluded below since a bad
+# certificate does not fix itself between attempts
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None or retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class Deadline:
+    """Point in time after which no new requests should be started."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Get the seconds left, or None if there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed."""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed request is retried.
+
+    Only retryable errors are retried, after a random delay between 0 and
+    base_delay * 2 ** attempt capped at max_delay ("full jitter"). A
+    Retry-After header replaces the random delay; if it asks for more than
+    max_delay the request is not retried.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 0.5, max_delay: float = 30):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: requests.exceptions.RequestException) -> bool:
+        """
+        Check whether a request error may succeed when retried.
+
+        Args:
+            error: Error raised by requests
+
+        Returns:
+            True for retryable statuses and transient transport errors
+        """
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.exceptions.HTTPError) and response is not None:
+            return response.status_code in RETRYABLE_STATUSES
+        if isinstance(error, requests.exceptions.SSLError):
+            return False
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    def backoff(
+        self, attempt: int, response: Optional[requests.Response] = None
+    ) -> Optional[float]:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            response: Response of the failed attempt, if any
+
+        Returns:
+            Seconds to wait, or None if the request should not be retried
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_delay else None
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
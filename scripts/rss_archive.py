@@ -0,0 +1,112 @@
+"""
+Archived pages of the merged RSS feed (RFC 5005)
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+from entry_store import entry_guid
+from models import entry_timestamp
+from utils import load_json_file, save_json_file
+
+# Namespace of the fh:archive element marking archive documents
+HISTORY_NAMESPACE = "http://purl.org/syndication/history/1.0"
+
+
+def archive_key(entry) -> list:
+    """
+    Get the key ordering entries into pages.
+
+    Args:
+        entry: Entry or entry dictionary
+
+    Returns:
+        Publication epoch, feed URL and GUID, so entries with equal dates
+        keep a stable order
+    """
+    return [entry_timestamp(entry), entry.get("feed_url") or "", entry_guid(entry)]
+
+
+def archive_page_name(content: str) -> str:
+    """
+    Name an archive page after a hash of its content.
+
+    Args:
+        content: Rendered page
+
+    Returns:
+        File name, e.g. "rss-0123456789abcdef.xml"
+    """
+    digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return f"rss-{digest}.xml"
+
+
+class RSSArchive:
+    """
+    Immutable archive pages of the merged feed, oldest first.
+
+    The current page holds every entry newer than the newest archived one.
+    Once it reaches twice the page size, its oldest page_size entries move
+    to a new archive page that links to the previous one, so readers
+    polling the current page always see at least page_size entries and
+    archive pages never change once written. Entries published before the
+    newest archived entry that show up later are not archived.
+    """
+
+    def __init__(self, path: str, page_size: int):
+        self.path = path
+        self.page_size = page_size
+        self.pages: List[dict] = load_json_file(path, {}).get("pages", [])
+
+    @property
+    def cutoff(self) -> Optional[list]:
+        """archive_key of the newest archived entry, if any."""
+        return self.pages[-1]["newest"] if self.pages else None
+
+    @property
+    def latest_page(self) -> Optional[str]:
+        """File name of the newest archive page, if there is one."""
+        return self.pages[-1]["file"] if self.pages else None
+
+    def split(self, entries) -> Tuple[List, List[List]]:
+        """
+        Split entries into the current page and new archive pages.
+
+        Args:
+            entries: Candidate entries, in any order
+
+        Returns:
+            Entries of the current page, newest first, and the entries of
+            each new archive page, oldest page first and newest entry first
+        """
+        keyed = [(archive_key(entry), entry) for entry in entries]
+        if self.cutoff is not None:
+            keyed = [pair for pair in keyed if pair[0] > self.cutoff]
+        keyed.sort(key=lambda pair: pair[0], reverse=True)
+        current = [entry for _, entry in keyed]
+
+        pages = []
+        while len(current) >= 2 * self.page_size:
+            pages.append(current[-self.page_size :])
+            current = current[: -self.page_size]
+        return current, pages
+
+    def add_page(self, file_name: str, entries: List):
+        """
+        Record a written archive page.
+
+        Args:
+            file_name: Page file name from archive_page_name
+            entries: Entries of the page, newest first
+        """
+        self.pages.append(
+            {
+                "file": file_name,
+                "newest": archive_key(entries[0]),
+                "count": len(entries),
+            }
+        )
+
+    def save(self):
+        """Persist the list of archive pages."""
+        save_json_file(self.path, {"pages": self.pages})
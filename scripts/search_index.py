@@ -0,0 +1,139 @@
+"""
+Inverted full-text search index for the generated page
+"""
+
+import re
+from itertools import groupby
+from typing import Dict, Iterable, List, Set, Tuple
+
+from models import entry_timestamp
+from utils import clean_html
+
+# Terms are grouped into shards by their first characters; the page only
+# loads the shards of the query's terms
+PREFIX_LENGTH = 2
+
+# Shorter terms are not indexed, so every term has a full prefix
+MIN_TERM_LENGTH = PREFIX_LENGTH
+MAX_TERM_LENGTH = 40
+
+# Number of consecutive document ids stored in one document shard
+DOCS_PER_SHARD = 500
+
+# Words too common to narrow a search; the page drops them from queries too
+STOPWORDS = frozenset(
+    """
+    an and are as at be but by for from has have in is it its of on or that
+    the this to was were will with
+    """.split()
+)
+
+# Letters, digits and underscores, like \p{L}\p{N}_ in the page's tokenizer
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into index terms.
+
+    Args:
+        text: Plain text
+
+    Returns:
+        Lowercased words that are neither too short, too long nor stopwords
+    """
+    if not text:
+        return set()
+    return {
+        term
+        for term in TOKEN.findall(text.lower())
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH and term not in STOPWORDS
+    }
+
+
+def entry_terms(entry) -> Set[str]:
+    """
+    Get the index terms of an entry's title, summary and feed title.
+
+    Args:
+        entry: Entry or entry dictionary
+
+    Returns:
+        Index terms
+    """
+    return (
+        tokenize(entry.get("title") or "")
+        | tokenize(clean_html(entry.get("summary") or ""))
+        | tokenize(entry.get("feed_title") or "")
+    )
+
+
+def search_document(entry) -> list:
+    """
+    Get the fields the page shows for a search result.
+
+    Args:
+        entry: Entry or entry dictionary
+
+    Returns:
+        Title, link, feed title and UTC epoch of publication
+    """
+    return [
+        entry.get("title") or "",
+        entry.get("link") or "",
+        entry.get("feed_title") or "",
+        entry_timestamp(entry),
+    ]
+
+
+def build_search_shards(
+    postings: Iterable[Tuple[str, int]], documents: Iterable[Tuple[int, list]]
+) -> Tuple[Dict[str, Dict[str, List[int]]], Dict[int, Dict[str, list]]]:
+    """
+    Group postings and documents into the shards loaded by the page.
+
+    Each term maps to its sorted document ids, stored as the first id
+    followed by the gaps between ids, which keeps the JSON small.
+
+    Args:
+        postings: (term, document id) pairs sorted by term, then id
+        documents: (document id, search_document) pairs
+
+    Returns:
+        Term shards keyed by term prefix, and document shards keyed by
+        document id // DOCS_PER_SHARD
+    """
+    term_shards: Dict[str, Dict[str, List[int]]] = {}
+    for term, pairs in groupby(postings, key=lambda pair: pair[0]):
+        previous = 0
+        gaps = []
+        for _, doc_id in pairs:
+            gaps.append(doc_id - previous)
+            previous = doc_id
+        term_shards.setdefault(term[:PREFIX_LENGTH], {})[term] = gaps
+
+    document_shards: Dict[int, Dict[str, list]] = {}
+    for doc_id, document in documents:
+        document_shards.setdefault(doc_id // DOCS_PER_SHARD, {})[str(doc_id)] = document
+    return term_shards, document_shards
+
+
+def index_entries(
+    entries: Iterable,
+) -> Tuple[List[Tuple[str, int]], List[Tuple[int, list]]]:
+    """
+    Index entries in memory, numbering them in order.
+
+    Args:
+        entries: Entries to index
+
+    Returns:
+        Sorted postings and documents for build_search_shards
+    """
+    postings = []
+    documents = []
+    for doc_id, entry in enumerate(entries):
+        postings.extend((term, doc_id) for term in entry_terms(entry))
+        documents.append((doc_id, search_document(entry)))
+    postings.sort()
+    return postings, documents
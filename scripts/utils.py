@@ -3,22 +3,245 @@ Utility functions for RSS processing
 """
 
 import re
+import hashlib
 import html
+import html.entities
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Union
+from html.parser import HTMLParser
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 import time
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
 
 import os
 
+from dates import parse_date
+from retry import Deadline, RetryPolicy
+
+
+# Defaults for the shared HTTP session, overridden by the "http" config section
+HTTP_DEFAULTS = MappingProxyType({
+    'pool_connections': 50,  # Number of hosts with a pooled keep-alive connection
+    # Connections kept per host; None sizes the pool for every thread that
+    # may share a host: the fetch threads plus the favicon probe threads
+    'pool_maxsize': None,
+    'timeout': 10,  # Feed request timeout in seconds
+    'page_timeout': 5,  # Homepage request timeout in seconds (favicon lookup)
+    'favicon_timeout': 3,  # Favicon probe timeout in seconds
+})
+
+# Feed formats, preferred over generic XML and anything else
+FEED_ACCEPT = (
+    'application/rss+xml, application/atom+xml, application/xml;q=0.9, '
+    'text/xml;q=0.9, */*;q=0.8'
+)
+
+# Content codings urllib3 can decode here: gzip and deflate, plus br when a
+# Brotli package is installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Bytes read per chunk when streaming response bodies
+BODY_CHUNK_SIZE = 64 * 1024
+
+_http_session: Optional[requests.Session] = None
+
+# Settings of the shared session: HTTP_DEFAULTS merged with the config
+_http_settings: Dict = dict(HTTP_DEFAULTS)
+
+# Threads probing favicon candidates, shared by all lookups so queued probes
+# that are no longer needed can be cancelled
+FAVICON_PROBE_WORKERS = 32
+_probe_executor: Optional[ThreadPoolExecutor] = None
+_probe_executor_lock = threading.Lock()
+
+# Seconds spent opening connections (DNS, TCP and TLS) by the current thread
+_connect_timing = threading.local()
+
+
+def _record_connect_time(seconds: float) -> None:
+    _connect_timing.seconds = getattr(_connect_timing, 'seconds', 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """Pooled adapter whose new connections record their setup time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def configure_http(
+    settings: Optional[Dict] = None, fetch_workers: int = 1
+) -> requests.Session:
+    """
+    Create the shared HTTP session used for feed, homepage and favicon requests.
+
+    Connections are pooled per host and kept alive, so each host's TCP/TLS
+    handshake is paid once per run.
+
+    Args:
+        settings: Overrides for HTTP_DEFAULTS
+        fetch_workers: Number of fetch threads sharing the session
+
+    Returns:
+        The shared session
+    """
+    global _http_session, _http_settings
+
+    # Merge into a copy, so each configuration starts from the defaults
+    _http_settings = {**HTTP_DEFAULTS, **(settings or {})}
+    if _http_settings['pool_maxsize'] is None:
+        # Enough connections that no thread's connection is discarded when
+        # all of them talk to one host
+        _http_settings['pool_maxsize'] = fetch_workers + FAVICON_PROBE_WORKERS
+
+    adapter = _TimedHTTPAdapter(
+        pool_connections=_http_settings['pool_connections'],
+        pool_maxsize=_http_settings['pool_maxsize'],
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if _http_session is not None:
+        _http_session.close()
+    _http_session = session
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the shared HTTP session, creating it with default settings if needed.
+
+    Returns:
+        The shared session
+    """
+    if _http_session is None:
+        return configure_http()
+    return _http_session
+
+
+class _TextExtractor(HTMLParser):
+    """
+    HTML tokenizer that collects the text BeautifulSoup's get_text() would return.
+
+    Text inside script and style (removed by the old implementation) and inside
+    template, rt and rp (not text content in BeautifulSoup) is dropped. Open
+    elements are tracked the way BeautifulSoup's html.parser builder nests them.
+    """
+
+    REMOVED_TAGS = frozenset(('script', 'style'))
+    SKIPPED_TAGS = REMOVED_TAGS | frozenset(('template', 'rt', 'rp'))
+    VOID_TAGS = frozenset((
+        'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed',
+        'frame', 'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link',
+        'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+    ))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self.open_tags: List[str] = []
+        self.skip_depth = 0
+        self.removed_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in self.SKIPPED_TAGS:
+            self.skip_depth += 1
+            if tag in self.REMOVED_TAGS:
+                self.removed_depth += 1
+
+    def handle_endtag(self, tag):
+        # Close everything up to the most recent matching open tag, if any
+        if tag not in self.open_tags:
+            return
+        while True:
+            closed = self.open_tags.pop()
+            if closed in self.SKIPPED_TAGS:
+                self.skip_depth -= 1
+                if closed in self.REMOVED_TAGS:
+                    self.removed_depth -= 1
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def handle_entityref(self, name):
+        # Unknown entities are kept as the literal "&name"
+        self.handle_data(html.entities.html5.get(f'{name};', f'&{name}'))
+
+    def handle_charref(self, name):
+        self.handle_data(html.unescape(f'&#{name};'))
+
+    def unknown_decl(self, data):
+        # CDATA sections are text content (even inside template, rt and rp),
+        # other declarations are not
+        if data.startswith('CDATA[') and not self.removed_depth:
+            cdata = data[len('CDATA['):]
+            if not cdata and 'pre' not in self.open_tags and 'textarea' not in self.open_tags:
+                # BeautifulSoup turns an empty section into a single space
+                cdata = ' '
+            self.parts.append(cdata)
+
+
+# Cleaned text keyed by a hash of the raw HTML, shared across runs
+_clean_html_cache: Dict[str, str] = {}
+_clean_html_used: set = set()
+
 
 def clean_html(text: str) -> str:
     """
     Clean HTML content for display.
 
+    Results are memoized by content hash, so unchanged summaries are only
+    cleaned once (see load_clean_html_cache).
+
     Args:
         text: Raw HTML text
 
@@ -28,15 +251,17 @@ def clean_html(text: str) -> str:
     if not text:
         return ""
 
-    # Use BeautifulSoup for better HTML cleaning
-    soup = BeautifulSoup(text, 'html.parser')
+    key = _clean_html_key(text)
+    _clean_html_used.add(key)
+    cached = _clean_html_cache.get(key)
+    if cached is not None:
+        return cached
 
-    # Remove script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-
-    # Get text and clean up
-    clean_text = soup.get_text()
+    # Tokenize without building a DOM, dropping script and style content
+    extractor = _TextExtractor()
+    extractor.feed(text)
+    extractor.close()
+    clean_text = ''.join(extractor.parts)
 
     # Decode HTML entities
     clean_text = html.unescape(clean_text)
@@ -44,9 +269,50 @@ def clean_html(text: str) -> str:
     # Clean up whitespace
     clean_text = re.sub(r'\s+', ' ', clean_text).strip()
 
+    _clean_html_cache[key] = clean_text
     return clean_text
 
 
+def _clean_html_key(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def keep_clean_html(texts: Iterable[str]) -> None:
+    """
+    Keep the memoized results of texts that were not cleaned this run.
+
+    Outputs skipped because they did not change still need their cleaned
+    summaries on the next run.
+
+    Args:
+        texts: Raw HTML texts
+    """
+    _clean_html_used.update(_clean_html_key(text) for text in texts if text)
+
+
+def load_clean_html_cache(file_path: str) -> None:
+    """
+    Load cleaned summaries memoized by a previous run.
+
+    Args:
+        file_path: Path to the cache file
+    """
+    _clean_html_cache.update(load_json_file(file_path, {}))
+
+
+def save_clean_html_cache(file_path: str) -> None:
+    """
+    Save the memoized summaries used during this run.
+
+    Args:
+        file_path: Path to the cache file
+    """
+    save_json_file(
+        file_path,
+        {key: _clean_html_cache[key] for key in _clean_html_used if key in _clean_html_cache},
+    )
+
+
 def safe_get_text(element: Dict, key: str, default: str = "") -> str:
     """
     Safely get text from feed element.
@@ -65,12 +331,12 @@ def safe_get_text(element: Dict, key: str, default: str = "") -> str:
     return str(value) if value else default
 
 
-def format_date(date_str: Optional[str]) -> str:
+def format_date(date_str: Optional[Union[str, int]]) -> str:
     """
     Format date string for display.
 
     Args:
-        date_str: Date string from feed
+        date_str: Date string from feed, or a UTC epoch
 
     Returns:
         Formatted date string
@@ -78,27 +344,19 @@ def format_date(date_str: Optional[str]) -> str:
     if not date_str:
         return "Unknown date"
 
-    try:
-        # Try to parse and reformat with timezone handling
-        from dateutil import parser
-        # Define timezone mappings for common abbreviations
-        tzinfos = {
-            'UT': timezone.utc,
-            'UTC': timezone.utc,
-            'GMT': timezone.utc,
-        }
-        dt = parser.parse(date_str, tzinfos=tzinfos)
-        return dt.strftime("%B %d, %Y at %H:%M UTC")
-    except Exception:
+    timestamp = date_str if isinstance(date_str, int) else parse_date(date_str)
+    if not timestamp:
         return date_str
+    dt = datetime.fromtimestamp(timestamp, timezone.utc)
+    return dt.strftime("%B %d, %Y at %H:%M UTC")
 
 
-def format_relative_time(date_str: Optional[str]) -> str:
+def format_relative_time(date_str: Optional[Union[str, int]]) -> str:
     """
     Format date string as relative time (e.g., "2 hours ago", "3 days ago").
 
     Args:
-        date_str: Date string from feed
+        date_str: Date string from feed, or a UTC epoch
 
     Returns:
         Relative time string
@@ -106,47 +364,31 @@ def format_relative_time(date_str: Optional[str]) -> str:
     if not date_str:
         return "Unknown time"
 
-    try:
-        # Try to parse the date string
-        from dateutil import parser
-        # Define timezone mappings for common abbreviations
-        tzinfos = {
-            'UT': timezone.utc,
-            'UTC': timezone.utc,
-            'GMT': timezone.utc,
-        }
-        dt = parser.parse(date_str, tzinfos=tzinfos)
-
-        # Calculate time difference
-        now = datetime.now(timezone.utc)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-
-        time_diff = now - dt
-        total_seconds = int(time_diff.total_seconds())
-
-        # Return relative time
-        if total_seconds < 60:
-            return "Just now"
-        elif total_seconds < 3600:  # Less than 1 hour
-            minutes = total_seconds // 60
-            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-        elif total_seconds < 86400:  # Less than 1 day
-            hours = total_seconds // 3600
-            return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        elif total_seconds < 2592000:  # Less than 30 days
-            days = total_seconds // 86400
-            return f"{days} day{'s' if days != 1 else ''} ago"
-        elif total_seconds < 31536000:  # Less than 1 year
-            months = total_seconds // 2592000
-            return f"{months} month{'s' if months != 1 else ''} ago"
-        else:
-            years = total_seconds // 31536000
-            return f"{years} year{'s' if years != 1 else ''} ago"
-
-    except Exception:
+    timestamp = date_str if isinstance(date_str, int) else parse_date(date_str)
+    if not timestamp:
         return date_str
 
+    total_seconds = int(time.time()) - timestamp
+
+    # Return relative time
+    if total_seconds < 60:
+        return "Just now"
+    elif total_seconds < 3600:  # Less than 1 hour
+        minutes = total_seconds // 60
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    elif total_seconds < 86400:  # Less than 1 day
+        hours = total_seconds // 3600
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    elif total_seconds < 2592000:  # Less than 30 days
+        days = total_seconds // 86400
+        return f"{days} day{'s' if days != 1 else ''} ago"
+    elif total_seconds < 31536000:  # Less than 1 year
+        months = total_seconds // 2592000
+        return f"{months} month{'s' if months != 1 else ''} ago"
+    else:
+        years = total_seconds // 31536000
+        return f"{years} year{'s' if years != 1 else ''} ago"
+
 
 def truncate_text(text: str, max_length: int = 200) -> str:
     """
@@ -206,35 +448,145 @@ def get_domain(url: str) -> str:
         return "unknown"
 
 
-def fetch_with_retry(url: str, timeout: int = 10, retries: int = 3) -> Optional[requests.Response]:
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """Response body larger than the allowed number of bytes."""
+
+
+def _read_body(response: requests.Response, max_bytes: Optional[int] = None):
+    """
+    Download a streamed response body, aborting once it exceeds max_bytes.
+
+    Compressed bodies are decoded while streaming, so max_bytes bounds the
+    memory the body takes. Afterwards response.content holds the body.
+    """
+    declared = response.headers.get('Content-Length', '')
+    if max_bytes and declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(
+            f"{response.url} declares {declared} bytes, over the {max_bytes} byte limit"
+        )
+
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            response.close()
+            raise ResponseTooLarge(
+                f"{response.url} exceeds the {max_bytes} byte limit"
+            )
+        chunks.append(chunk)
+    response._content = b''.join(chunks)
+
+
+def _wire_bytes(response: requests.Response) -> int:
+    """Get the number of body bytes transferred, before decompression."""
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(response.content)
+
+
+def fetch_with_retry(
+    url: str,
+    timeout: Optional[float] = None,
+    retries: int = 3,
+    extra_headers: Optional[Dict[str, str]] = None,
+    stats: Optional[Dict] = None,
+    policy: Optional[RetryPolicy] = None,
+    deadline: Optional[Deadline] = None,
+    max_bytes: Optional[int] = None,
+) -> Optional[requests.Response]:
     """
     Fetch URL with retry logic.
 
     Args:
         url: URL to fetch
-        timeout: Request timeout in seconds
-        retries: Number of retry attempts
+        timeout: Request timeout in seconds (defaults to the configured timeout)
+        retries: Number of attempts, used when no policy is given
+        extra_headers: Additional request headers (e.g. conditional GET headers)
+        stats: Dictionary filled with request telemetry (optional): connect_time
+            (DNS, TCP and TLS setup), response_time, bytes (decoded),
+            wire_bytes (as transferred), status, retries, error and abandoned
+            (the deadline stopped the request)
+        policy: Retry policy deciding which errors are retried and how long
+            to wait between attempts (optional)
+        deadline: Run-wide deadline; no attempt or wait extends past it
+            (optional)
+        max_bytes: Maximum decoded body size; larger downloads are aborted
+            and not retried (optional)
 
     Returns:
-        Response object or None if failed
+        Response object (which may be a 304 Not Modified) or None if failed
     """
     headers = {
-        'User-Agent': 'lovelyRSS/1.0 (RSS aggregator; +https://github.com/your-username/rss)'
+        'User-Agent': 'lovelyRSS/1.0 (RSS aggregator; +https://github.com/your-username/rss)',
+        'Accept': FEED_ACCEPT,
+        'Accept-Encoding': ACCEPT_ENCODING,
     }
 
+    if extra_headers:
+        headers.update(extra_headers)
+
+    if timeout is None:
+        timeout = _http_settings['timeout']
+    if policy is None:
+        policy = RetryPolicy(retries=retries)
+
+    session = get_http_session()
+    if stats is None:
+        stats = {}
+    _connect_timing.seconds = 0.0
+    start = time.perf_counter()
+
+    def record(attempt, response=None, error=None):
+        stats['connect_time'] = round(_connect_timing.seconds, 4)
+        stats['response_time'] = round(time.perf_counter() - start, 4)
+        stats['retries'] = attempt
+        if response is not None:
+            stats['status'] = response.status_code
+            stats['bytes'] = len(response.content)
+            stats['wire_bytes'] = _wire_bytes(response)
+        if error is not None:
+            stats['error'] = str(error)
+
+    for attempt in range(policy.retries):
+        attempt_timeout = timeout
+        if deadline and deadline.remaining() is not None:
+            if deadline.expired():
+                print(f"⌛ Run deadline reached, abandoning {url}")
+                stats['abandoned'] = True
+                record(attempt, error='Run deadline reached')
+                return None
+            attempt_timeout = min(timeout, deadline.remaining())
 
-    headers['Accept'] = 'application/atom+xml'
-
-    for attempt in range(retries):
         try:
-            response = requests.get(url, timeout=timeout, headers=headers)
+            response = session.get(
+                url, timeout=attempt_timeout, headers=headers, stream=True
+            )
+            _read_body(response, max_bytes)
             response.raise_for_status()
+            record(attempt, response)
             return response
         except requests.exceptions.RequestException as e:
-            if attempt == retries - 1:  # Last attempt
-                print(f"Failed to fetch {url} after {retries} attempts: {e}")
+            response = getattr(e, 'response', None)
+            delay = None
+            if attempt < policy.retries - 1 and policy.is_retryable(e):
+                delay = policy.backoff(attempt, response)
+            if delay is None:
+                print(f"Failed to fetch {url} after {attempt + 1} attempts: {e}")
+                record(attempt, response, e)
+                return None
+
+            remaining = deadline.remaining() if deadline else None
+            if remaining is not None and delay >= remaining:
+                print(f"⌛ Run deadline reached, abandoning {url}: {e}")
+                stats['abandoned'] = True
+                record(attempt, response, e)
                 return None
-            print(f"Attempt {attempt + 1} failed for {url}: {e}")
+
+            print(f"Attempt {attempt + 1} failed for {url}: {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
 
     return None
 
@@ -259,6 +611,92 @@ def get_readable_timestamp() -> str:
     return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
 
 
+def load_json_file(file_path: str, default=None):
+    """
+    Load JSON data persisted by a previous run.
+
+    Args:
+        file_path: Path to the JSON file
+        default: Value returned if the file is missing or unreadable
+
+    Returns:
+        Decoded JSON data or default
+    """
+    if not os.path.exists(file_path):
+        return default
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable state file {file_path}: {e}")
+        return default
+
+
+@contextmanager
+def atomic_write(file_path: str, encoding: str = 'utf-8', errors: str = 'strict'):
+    """
+    Open a temporary file that replaces file_path only once writing succeeds.
+
+    Readers never see a partially written file, even if the run crashes.
+
+    Args:
+        file_path: Path of the file to write
+        encoding: Text encoding
+        errors: Encoding error handler
+
+    Yields:
+        Text file object
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, errors=errors) as f:
+            yield f
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_json_file(file_path: str, data) -> None:
+    """
+    Atomically write JSON data so an interrupted run never leaves a partial file.
+
+    Args:
+        file_path: Path to the JSON file
+        data: JSON-serializable data
+    """
+    with atomic_write(file_path) as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def save_json_shard(directory: str, prefix: str, data) -> str:
+    """
+    Write JSON data to a file named after a hash of its content.
+
+    Unchanged data keeps its file name, so browsers can cache shards
+    indefinitely and existing files are not rewritten.
+
+    Args:
+        directory: Directory for the shard
+        prefix: File name prefix, e.g. "feed"
+        data: JSON-serializable data
+
+    Returns:
+        The shard's file name, relative to directory
+    """
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    file_name = f"{prefix}-{digest}.json"
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        with atomic_write(path) as f:
+            f.write(content)
+    return file_name
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename for safe file system usage.
@@ -275,13 +713,24 @@ def sanitize_filename(filename: str) -> str:
     return sanitized[:255]  # Limit length
 
 
-def get_favicon_url(feed_url: str, feed_link: Optional[str] = None) -> Optional[str]:
+def get_favicon_url(
+    feed_url: str,
+    feed_link: Optional[str] = None,
+    cache: Optional[Dict[str, Dict]] = None,
+    cache_ttl: float = 0,
+    force_refresh: bool = False,
+    time_budget: Optional[float] = None,
+) -> Optional[str]:
     """
     Fetch favicon URL for a given feed.
 
     Args:
         feed_url: RSS feed URL
         feed_link: Website link from feed (optional)
+        cache: Favicon cache keyed by site origin, updated in place (optional)
+        cache_ttl: Seconds a cached result (including "not found") stays valid
+        force_refresh: Ignore cached results and resolve again
+        time_budget: Maximum seconds spent on network lookups (optional)
 
     Returns:
         Favicon URL or None if not found
@@ -306,11 +755,47 @@ def get_favicon_url(feed_url: str, feed_link: Optional[str] = None) -> Optional[
 
     # Use feed_link if available, otherwise derive from feed_url
     base_url = feed_link if feed_link else feed_url
+    parsed = urlparse(base_url)
+    base_domain = f"{parsed.scheme}://{parsed.netloc}"
+
+    if cache is not None and not force_refresh:
+        cached = cache.get(base_domain)
+        if cached and time.time() - cached.get("checked_at", 0) < cache_ttl:
+            return cached.get("url")
+
+    favicon_url, complete = discover_favicon_url(base_url, base_domain, time_budget)
+
+    # "Not found" is only cached when the lookup finished; a lookup cut short
+    # by the budget or a network error is tried again on the next run
+    if cache is not None and (favicon_url or complete):
+        cache[base_domain] = {"url": favicon_url, "checked_at": time.time()}
+
+    return favicon_url
 
-    try:
-        parsed = urlparse(base_url)
-        base_domain = f"{parsed.scheme}://{parsed.netloc}"
 
+def discover_favicon_url(
+    base_url: str, base_domain: str, time_budget: Optional[float] = None
+) -> Tuple[Optional[str], bool]:
+    """
+    Look up a site's favicon over the network.
+
+    Args:
+        base_url: Website URL whose page may declare icon links
+        base_domain: Site origin (scheme and host)
+        time_budget: Maximum seconds spent on the lookup (optional)
+
+    Returns:
+        Tuple of the favicon URL (or None) and whether the lookup completed;
+        it is incomplete if the budget ran out or a request failed on the
+        network, so a missing icon may just not have been found yet
+    """
+    # A budget of 0 means the run deadline has already passed
+    if time_budget is not None and time_budget <= 0:
+        return None, False
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    complete = True
+
+    try:
         # Try common favicon locations
         favicon_candidates = [
             urljoin(base_domain, "/favicon.ico"),
@@ -320,7 +805,16 @@ def get_favicon_url(feed_url: str, feed_link: Optional[str] = None) -> Optional[
 
         # Try to fetch the website and look for favicon in HTML
         try:
-            response = fetch_with_retry(base_url, timeout=5)
+            page_timeout = _http_settings['page_timeout']
+            if deadline is not None:
+                page_timeout = min(page_timeout, deadline - time.monotonic())
+            page_stats = {}
+            response = fetch_with_retry(
+                base_url, timeout=page_timeout, retries=1, stats=page_stats
+            )
+            if response is None and 'status' not in page_stats:
+                # The page was not reached, so its icon links are unknown
+                complete = False
             if response and response.text:
                 # Use XML parser if it looks like XML, otherwise HTML parser
                 parser = 'xml' if response.text.strip().startswith('<?xml') else 'html.parser'
@@ -334,17 +828,80 @@ def get_favicon_url(feed_url: str, feed_link: Optional[str] = None) -> Optional[
                         favicon_url = urljoin(base_domain, href)
                         favicon_candidates.insert(0, favicon_url)
         except Exception:
-            pass  # Continue with default candidates
+            complete = False  # Continue with default candidates
 
-        # Test each candidate
-        for favicon_url in favicon_candidates:
-            if test_favicon_url(favicon_url):
-                return favicon_url
+        favicon_url, probes_complete = probe_favicon_candidates(
+            favicon_candidates, deadline
+        )
+        return favicon_url, complete and probes_complete
 
     except Exception as e:
-        print(f"Error getting favicon for {feed_url}: {e}")
+        print(f"Error getting favicon for {base_url}: {e}")
 
-    return None
+    return None, False
+
+
+def probe_favicon_candidates(
+    candidates: List[str], deadline: Optional[float] = None
+) -> Tuple[Optional[str], bool]:
+    """
+    Test favicon candidates concurrently and pick the best reachable one.
+
+    Candidates are probed on a thread pool shared by all lookups; the first
+    success in priority order wins. Probes that have not started by then
+    are cancelled, while running ones finish in the background within
+    their timeout, which never extends past the deadline.
+
+    Args:
+        candidates: Favicon URLs, highest priority first
+        deadline: time.monotonic() value after which probing gives up (optional)
+
+    Returns:
+        Tuple of the favicon URL (or None) and whether every probe needed to
+        decide finished without a network error
+    """
+    # Drop duplicates but keep priority order
+    candidates = list(dict.fromkeys(candidates))
+    if not candidates:
+        return None, True
+
+    timeout = _http_settings['favicon_timeout']
+    if deadline is not None:
+        timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            return None, False
+
+    complete = True
+    executor = _get_probe_executor()
+    futures = [executor.submit(test_favicon_url, url, timeout) for url in candidates]
+    try:
+        for favicon_url, future in zip(candidates, futures):
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            try:
+                reachable = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                return None, False
+            if reachable:
+                return favicon_url, True
+            if reachable is None:
+                complete = False
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return None, complete
+
+
+def _get_probe_executor() -> ThreadPoolExecutor:
+    global _probe_executor
+    with _probe_executor_lock:
+        if _probe_executor is None:
+            _probe_executor = ThreadPoolExecutor(
+                max_workers=FAVICON_PROBE_WORKERS, thread_name_prefix='favicon-probe'
+            )
+        return _probe_executor
 
 
 def is_github_profile_feed(feed_url: str) -> bool:
@@ -396,21 +953,29 @@ def extract_github_username(feed_url: str) -> Optional[str]:
     return None
 
 
-def test_favicon_url(favicon_url: str) -> bool:
+def test_favicon_url(
+    favicon_url: str, timeout: Optional[float] = None
+) -> Optional[bool]:
     """
     Test if a favicon URL is accessible.
 
     Args:
         favicon_url: URL to test
+        timeout: Request timeout in seconds (defaults to the configured timeout)
 
     Returns:
-        True if accessible, False otherwise
+        True if accessible, False if not, None if the request failed on the
+        network or timed out
     """
     try:
         headers = {
             'User-Agent': 'lovelyRSS/1.0 (RSS aggregator; favicon check)'
         }
-        response = requests.head(favicon_url, timeout=3, headers=headers)
+        if timeout is None:
+            timeout = _http_settings['favicon_timeout']
+        response = get_http_session().head(favicon_url, timeout=timeout, headers=headers)
         return response.status_code == 200
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        return None
     except Exception:
         return False
@@ -0,0 +1,103 @@
+"""
+Streaming XML writer for the generated RSS files
+"""
+
+from typing import IO, List, Optional, Sequence, Tuple
+
+
+def escape_text(text: str) -> str:
+    """Escape character data like ElementTree does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(text: str) -> str:
+    """Escape an attribute value like ElementTree does."""
+    text = escape_text(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+class XMLStreamWriter:
+    """
+    Write an XML document element by element instead of building a tree.
+
+    The output is byte-identical to building the same document with
+    ElementTree, running ET.indent(tree, space=indent) and writing it with
+    tree.write(file, encoding="utf-8", xml_declaration=True).
+    """
+
+    def __init__(self, file: IO[str], indent: str = "  "):
+        self.file = file
+        self.indent = indent
+        self.open_tags: List[str] = []
+        # Whether the innermost open tag's start is still missing its ">"
+        self.start_pending = False
+        file.write("<?xml version='1.0' encoding='utf-8'?>\n")
+
+    def start(self, tag: str, attrib: Sequence[Tuple[str, str]] = ()):
+        """
+        Open an element that will contain child elements.
+
+        Args:
+            tag: Element tag
+            attrib: Attribute name and value pairs, in output order
+        """
+        self._begin_child()
+        self.file.write(f"<{tag}{self._attributes(attrib)}")
+        self.open_tags.append(tag)
+        self.start_pending = True
+
+    def element(
+        self,
+        tag: str,
+        text: Optional[str] = None,
+        attrib: Sequence[Tuple[str, str]] = (),
+    ):
+        """
+        Write a complete element with optional text and no children.
+
+        Args:
+            tag: Element tag
+            text: Text content; empty text writes a self-closing element
+            attrib: Attribute name and value pairs, in output order
+        """
+        self._begin_child()
+        if text:
+            self.file.write(
+                f"<{tag}{self._attributes(attrib)}>{escape_text(text)}</{tag}>"
+            )
+        else:
+            self.file.write(f"<{tag}{self._attributes(attrib)} />")
+
+    def end(self):
+        """Close the innermost open element."""
+        tag = self.open_tags.pop()
+        if self.start_pending:
+            self.file.write(" />")
+            self.start_pending = False
+        else:
+            self.file.write(f"\n{self.indent * len(self.open_tags)}</{tag}>")
+
+    def _begin_child(self):
+        if self.start_pending:
+            self.file.write(">")
+            self.start_pending = False
+        if self.open_tags:
+            self.file.write(f"\n{self.indent * len(self.open_tags)}")
+
+    @staticmethod
+    def _attributes(attrib: Sequence[Tuple[str, str]]) -> str:
+        return "".join(f' {name}="{escape_attribute(value)}"' for name, value in attrib)
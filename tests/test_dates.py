@@ -0,0 +1,37 @@
+import sys
+import time
+
+sys.path.append("scripts")
+
+from scripts.dates import epoch_to_iso, parse_date, struct_to_epoch
+from scripts.models import entry_timestamp
+
+EPOCH = 1698400800  # 2023-10-27 10:00:00 UTC
+
+
+def test_parse_date_formats():
+    assert parse_date("Fri, 27 Oct 2023 10:00:00 GMT") == EPOCH
+    assert parse_date("Fri, 27 Oct 2023 12:00:00 +0200") == EPOCH
+    assert parse_date("27 Oct 2023 10:00:00") == EPOCH  # No zone means UTC
+    assert parse_date("2023-10-27T10:00:00Z") == EPOCH
+    assert parse_date("2023-10-27T11:00:00+01:00") == EPOCH
+    assert parse_date("2023-10-27T10:00:00.123456") == EPOCH
+    # Neither fast path; dateutil handles it
+    assert parse_date("October 27, 2023 10:00 UTC") == EPOCH
+    assert parse_date("invalid-date") == 0
+    assert parse_date(None) == 0
+
+
+def test_struct_to_epoch_and_iso():
+    assert struct_to_epoch(time.gmtime(EPOCH)) == EPOCH
+    assert struct_to_epoch(list(time.gmtime(EPOCH))) == EPOCH
+    assert struct_to_epoch(None) == 0
+    assert epoch_to_iso(EPOCH) == "2023-10-27T10:00:00+00:00"
+    assert epoch_to_iso(0) is None
+
+
+def test_entry_timestamp_fallbacks():
+    assert entry_timestamp({"published_parsed": time.gmtime(EPOCH)}) == EPOCH
+    assert entry_timestamp({"updated_parsed": time.gmtime(EPOCH)}) == EPOCH
+    assert entry_timestamp({"updated": "2023-10-27T10:00:00Z"}) == EPOCH
+    assert entry_timestamp({}) == 0
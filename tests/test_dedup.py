@@ -0,0 +1,90 @@
+import sys
+
+import pytest
+
+sys.path.append("scripts")
+from scripts.dedup import DedupIndex, entry_keys, normalize_link
+from scripts.models import Entry
+
+DAY = 24 * 60 * 60
+NOW = 1_700_000_000
+
+
+def make_entry(feed, title, link=None, guid=None, published_ts=NOW):
+    return Entry(
+        title=title,
+        link=link,
+        id=guid,
+        published_ts=published_ts,
+        feed_url=f"http://{feed}.example.com/feed.xml",
+    )
+
+
+def test_normalize_link():
+    assert (
+        normalize_link("https://www.Example.com/post/?utm_source=rss&id=3#comments")
+        == normalize_link("http://example.com/post?id=3")
+        == "example.com/post?id=3"
+    )
+    assert normalize_link("") == ""
+
+
+def test_entry_keys_skip_local_guids():
+    keys = entry_keys(make_entry("blog", "Hello  World", "https://a.com/x", guid="42"))
+    assert keys == ["link:a.com/x", "title:hello world\n2023-11-14"]
+
+    keys = entry_keys(make_entry("blog", "", guid="tag:a.com,2023:42", published_ts=0))
+    assert keys == ["guid:tag:a.com,2023:42"]
+
+
+def test_duplicates_across_feeds_are_collapsed():
+    index = DedupIndex()
+    original = make_entry("blog", "Post", "https://blog.com/post")
+    index.extend(
+        [
+            original,
+            make_entry("planet", "Post", "https://blog.com/post/?utm_medium=feed"),
+            make_entry("mirror", "post", "https://mirror.com/1", published_ts=NOW + 60),
+            make_entry("other", "Other post", "https://other.com/post"),
+        ]
+    )
+
+    assert [entry.feed_url for entry in index.entries] == [
+        original.feed_url,
+        "http://other.example.com/feed.xml",
+    ]
+    assert len(index.removed) == 2
+
+
+def test_entries_of_one_feed_are_kept():
+    index = DedupIndex()
+    index.extend(
+        [
+            make_entry("podcast", "Episode 1", "https://podcast.com/"),
+            make_entry("podcast", "Episode 2", "https://podcast.com/"),
+        ]
+    )
+    assert len(index.entries) == 2
+    assert not index.removed
+
+
+@pytest.mark.parametrize(
+    "policy, winner", [("first", "planet"), ("earliest", "blog"), ("latest", "hn")]
+)
+def test_winner_policy(policy, winner):
+    index = DedupIndex(policy)
+    index.extend(
+        [
+            make_entry("planet", "Post", "https://blog.com/post", published_ts=NOW),
+            make_entry("blog", "Post", "https://blog.com/post", published_ts=NOW - DAY),
+            make_entry("hn", "Post", "https://blog.com/post", published_ts=NOW + DAY),
+        ]
+    )
+    assert [entry.feed_url for entry in index.entries] == [
+        f"http://{winner}.example.com/feed.xml"
+    ]
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        DedupIndex("random")
@@ -0,0 +1,113 @@
+import sys
+import time
+
+sys.path.append("scripts")
+from scripts.entry_store import EntryStore
+
+
+def make_entry(feed_url, guid, title, day):
+    return {
+        "id": guid,
+        "link": f"{feed_url}/{guid}",
+        "title": title,
+        "summary": f"Summary of {title}",
+        "published": f"2023-10-{day:02d}T10:00:00Z",
+        "published_parsed": time.strptime(f"2023-10-{day:02d} 10:00", "%Y-%m-%d %H:%M"),
+        "feed_title": feed_url,
+        "feed_url": feed_url,
+    }
+
+
+def test_upsert_only_new_or_changed(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    entries = [
+        make_entry("http://a.example/feed", "a1", "A1", 1),
+        make_entry("http://a.example/feed", "a2", "A2", 3),
+        make_entry("http://b.example/feed", "b1", "B1", 2),
+    ]
+    assert store.upsert_entries(entries) == 3
+    assert store.upsert_entries(entries) == 0
+
+    entries[0]["title"] = "A1 (edited)"
+    assert store.upsert_entries(entries) == 1
+    assert store.count() == 3
+
+    feed_url = "http://a.example/feed"
+    assert store.remove([(feed_url, "a1"), (feed_url, "missing")]) == 1
+    assert store.count() == 2
+
+
+def test_latest_queries_and_persistence(tmp_path):
+    path = str(tmp_path / "entries.db")
+    store = EntryStore(path)
+    store.upsert_entries(
+        [
+            make_entry("http://a.example/feed", "a1", "A1", 1),
+            make_entry("http://a.example/feed", "a2", "A2", 3),
+            make_entry("http://b.example/feed", "b1", "B1", 2),
+        ]
+    )
+    store.close()
+
+    # Entries that dropped out of a feed are still served on the next run
+    store = EntryStore(path)
+    assert [e["title"] for e in store.latest(2)] == ["A2", "B1"]
+    assert [e["title"] for e in store.latest_for_feed("http://a.example/feed", 10)] == [
+        "A2",
+        "A1",
+    ]
+
+    store.prune(["http://a.example/feed"])
+    assert store.count() == 2
+
+
+def test_same_guid_in_two_feeds_is_kept_per_feed(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    entries = [
+        make_entry("http://blog.example/feed", "1", "Post", 1),
+        make_entry("http://planet.example/feed", "1", "Post", 1),
+    ]
+    assert store.upsert_entries(entries) == 2
+    assert store.upsert_entries(entries) == 0
+    assert store.count() == 2
+    for entry in entries:
+        assert [e["title"] for e in store.latest_for_feed(entry["feed_url"], 10)] == [
+            "Post"
+        ]
+
+
+
+def test_retention_prunes_undated_entries_by_last_seen(tmp_path, monkeypatch):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    now = time.time()
+    undated = make_entry("http://a.example/feed", "old", "Old", 1)
+    undated["published"] = undated["published_parsed"] = None
+    monkeypatch.setattr(time, "time", lambda: now - 90 * 24 * 60 * 60)
+    store.upsert_entries([undated, make_entry("http://a.example/feed", "a1", "A1", 1)])
+
+    # Seen again today, so only the dated entry is past the retention period
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert store.upsert_entries([undated]) == 0
+    store.prune(["http://a.example/feed"], max_age_days=30)
+    assert [e["title"] for e in store.latest(10)] == ["Old"]
+
+    # Dropped from the feed and not seen for longer than the retention period
+    monkeypatch.setattr(time, "time", lambda: now + 60 * 24 * 60 * 60)
+    store.prune(["http://a.example/feed"], max_age_days=30)
+    assert store.count() == 0
+
+
+def test_find_copies_by_dedup_keys(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    entry = make_entry("http://a.example/feed", "a1", "A1", 1)
+    keys = lambda e: ["title:" + e["title"]]
+    store.upsert_entries([entry], keys)
+    assert [e["title"] for e in store.find_copies(["title:A1", "title:B1"])] == ["A1"]
+
+    # Keys of changed and removed entries are dropped
+    entry["title"] = "A1 (edited)"
+    assert store.upsert_entries([entry], keys) == 1
+    assert store.find_copies(["title:A1"]) == []
+    assert len(store.find_copies(["title:A1 (edited)"])) == 1
+    assert store.remove([("http://a.example/feed", "a1")]) == 1
+    assert store.find_copies(["title:A1 (edited)"]) == []
@@ -0,0 +1,49 @@
+import sys
+
+sys.path.append("scripts")
+from scripts.feed_failures import FeedFailures
+
+HOUR = 60 * 60
+NOW = 1_700_000_000
+URL = "http://example.com/feed.xml"
+
+
+def make_failures(tmp_path):
+    return FeedFailures(str(tmp_path / "feed_failures.json"), HOUR, 8 * HOUR)
+
+
+def test_backoff_grows_exponentially_with_jitter(tmp_path):
+    failures = make_failures(tmp_path)
+
+    delays = []
+    for _ in range(6):
+        failure = failures.record_failure(URL, "timed out", now=NOW)
+        delays.append(failure["retry_after"] - NOW)
+
+    for number, delay in enumerate(delays):
+        limit = min(HOUR * 2**number, 8 * HOUR)
+        assert limit / 2 <= delay <= limit
+    assert failures.feeds[URL]["failures"] == 6
+    assert failures.is_blocked(URL, now=NOW)
+    assert not failures.is_blocked(URL, now=NOW + 8 * HOUR)
+
+
+def test_success_resets_failures(tmp_path):
+    failures = make_failures(tmp_path)
+    failures.record_failure(URL, "503 Server Error", status=503, now=NOW)
+    failures.record_success(URL)
+
+    assert not failures.is_blocked(URL, now=NOW)
+    assert URL not in failures.feeds
+
+
+def test_gone_feeds_are_quarantined_and_persisted(tmp_path):
+    failures = make_failures(tmp_path)
+    failures.record_failure(URL, "410 Client Error: Gone", status=410, now=NOW)
+    failures.record_failure("http://example.com/other.xml", "404", status=404, now=NOW)
+    failures.save([URL])
+
+    reloaded = make_failures(tmp_path)
+    assert reloaded.quarantined() == [URL]
+    assert reloaded.is_blocked(URL, now=NOW + 365 * 24 * HOUR)
+    assert list(reloaded.feeds) == [URL]
@@ -0,0 +1,59 @@
+import sys
+
+sys.path.append("scripts")
+from scripts.feed_schedule import DUE_GRACE_SECONDS, FeedSchedule, publish_intervals
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+NOW = 1_700_000_000
+
+
+def make_schedule(tmp_path):
+    return FeedSchedule(str(tmp_path / "feed_schedule.json"), HOUR, DAY)
+
+
+def test_publish_intervals_ignore_undated_and_duplicates():
+    assert publish_intervals([0, NOW, NOW - HOUR, NOW, NOW - 3 * HOUR]) == [
+        HOUR,
+        2 * HOUR,
+    ]
+
+
+def test_interval_follows_cadence_within_limits(tmp_path):
+    schedule = make_schedule(tmp_path)
+
+    assert schedule.interval([]) == DAY
+    assert schedule.interval([8 * HOUR, 8 * HOUR, 10 * HOUR]) == 4 * HOUR
+    assert schedule.interval([60, 60, 60]) == HOUR
+    assert schedule.interval([30 * DAY]) == DAY
+
+
+def test_record_fetch_sets_next_due(tmp_path):
+    schedule = make_schedule(tmp_path)
+    url = "http://example.com/feed.xml"
+    timestamps = [NOW - 4 * HOUR, NOW - 8 * HOUR, NOW - 12 * HOUR]
+
+    assert schedule.is_due(url, now=NOW)
+    schedule.record_fetch(url, timestamps, now=NOW)
+
+    history = schedule.feeds[url]
+    assert history["intervals"] == [4 * HOUR, 4 * HOUR]
+    assert history["last_change"] == NOW
+    assert history["next_due"] == NOW + 2 * HOUR
+    assert not schedule.is_due(url, now=NOW + HOUR)
+    assert schedule.is_due(url, now=NOW + 2 * HOUR - DUE_GRACE_SECONDS)
+
+    # An unchanged feed keeps its last change and history
+    schedule.record_fetch(url, timestamps, now=NOW + 2 * HOUR)
+    assert schedule.feeds[url]["last_change"] == NOW
+    assert schedule.feeds[url]["next_due"] == NOW + 4 * HOUR
+
+
+def test_save_drops_unsubscribed_feeds(tmp_path):
+    schedule = make_schedule(tmp_path)
+    schedule.record_fetch("http://example.com/a.xml", [NOW], now=NOW)
+    schedule.record_fetch("http://example.com/b.xml", [NOW], now=NOW)
+    schedule.save(["http://example.com/a.xml"])
+
+    reloaded = make_schedule(tmp_path)
+    assert list(reloaded.feeds) == ["http://example.com/a.xml"]
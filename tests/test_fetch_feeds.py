@@ -2,7 +2,9 @@ import sys
 
 sys.path.append("scripts")
 from scripts.fetch_feeds import RSSHub
+from scripts.rss_archive import RSSArchive
 import feedparser
+import json
 import os
 import shutil
 import tempfile
@@ -117,6 +119,42 @@ def test_generate_latest_rss(hub):
         assert "<title>Entry 2</title>" not in content
 
 
+def test_latest_rss_archives_older_entries(hub, tmp_path):
+    hub.rss_archive = RSSArchive(str(tmp_path / "rss_archive.json"), page_size=1)
+    hub.generate_latest_rss()
+    first_page = hub.rss_archive.latest_page
+    hub.all_entries.append(
+        {
+            "title": "Entry 3",
+            "link": "http://example.com/entry3",
+            "published": "2023-10-28T10:00:00Z",
+            "feed_url": "http://example.com/feed1.xml",
+        }
+    )
+    hub.generate_latest_rss()
+    second_page = hub.rss_archive.latest_page
+
+    assert sorted(os.listdir("archive")) == sorted([first_page, second_page])
+    with open(os.path.join("archive", second_page)) as f:
+        content = f.read()
+    assert "<fh:archive />" in content
+    assert "<title>Entry 1</title>" in content
+    assert f'href="./{first_page}" rel="prev-archive"' in content
+    assert 'href="../test_rss.xml" rel="current"' in content
+    assert "lastBuildDate" not in content
+
+    with open(hub.config["output_files"]["rss"]) as f:
+        content = f.read()
+    assert "<title>Entry 3</title>" in content
+    assert "<title>Entry 1</title>" not in content
+    assert f'href="./archive/{second_page}" rel="prev-archive"' in content
+
+    # Archive pages are not rewritten when nothing new arrives
+    hub.generate_latest_rss()
+    assert hub.rss_archive.latest_page == second_page
+    assert len(os.listdir("archive")) == 2
+
+
 def test_generate_latest_feeds(hub):
     hub.generate_latest_feeds()
     feeds_file = hub.config["output_files"]["feeds"]
@@ -137,3 +175,448 @@ def test_generate_html(hub):
         assert "<title>Test Site</title>" in content
         assert "Test Site" in content
         assert "Test Description" in content
+
+
+def test_unchanged_outputs_are_not_rewritten(hub, monkeypatch):
+    import time
+
+    def generate(hub):
+        hub.generate_latest_rss()
+        hub.generate_latest_feeds()
+        hub.generate_html(hub.generate_site_data())
+        hub.save_state()
+
+    generate(hub)
+    assert hub.outputs_changed
+    outputs = list(hub.config["output_files"][key] for key in ("rss", "feeds", "html"))
+    mtimes = [os.stat(path).st_mtime_ns for path in outputs]
+
+    # Only the build timestamps differ in the next run
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_readable_timestamp", lambda: "2030-01-01 00:00:00 UTC"
+    )
+    time.sleep(0.01)
+    unchanged = create_mock_hub(hub.opml_file, "config.json", os.getcwd())
+    generate(unchanged)
+    assert not unchanged.outputs_changed
+    assert [os.stat(path).st_mtime_ns for path in outputs] == mtimes
+
+    changed = create_mock_hub(hub.opml_file, "config.json", os.getcwd())
+    changed.all_entries[0]["title"] = "Entry 1 (updated)"
+    generate(changed)
+    assert changed.outputs_changed
+    with open(hub.config["output_files"]["rss"]) as f:
+        assert "Entry 1 (updated)" in f.read()
+
+
+def test_generate_html_writes_content_hashed_shards(hub):
+    hub.feeds_with_updates[0]["category"] = "Tech"
+    site_data = hub.generate_site_data()
+    hub.generate_html(site_data)
+
+    with open(hub.config["output_files"]["html"]) as f:
+        content = f.read()
+    assert "Summary 1" not in content
+    assert "http://example.com/entry1" not in content
+
+    os.makedirs("data", exist_ok=True)
+    with open(os.path.join("data", "category-stale.json"), "w") as f:
+        f.write("[]")
+    index = hub.write_site_shards(site_data)
+
+    shards = sorted(os.listdir("data"))
+    assert "category-stale.json" not in shards
+    assert [category["name"] for category in index["categories"]] == [
+        "Tech",
+        "Uncategorized",
+    ]
+    with open(os.path.join("data", index["categories"][0]["shard"])) as f:
+        tech_feeds = json.load(f)
+    assert [feed["title"] for feed in tech_feeds] == ["Feed 1"]
+    with open(os.path.join("data", tech_feeds[0]["entries_shard"])) as f:
+        entries = json.load(f)
+    assert [entry["link"] for entry in entries] == ["http://example.com/entry1"]
+
+    # Unchanged data keeps its file names
+    assert hub.write_site_shards(site_data) == index
+    assert sorted(os.listdir("data")) == shards
+
+
+def test_search_shards_are_written_when_enabled(hub):
+    site_data = hub.generate_site_data()
+    assert hub.write_site_shards(site_data)["search_shard"] is None
+
+    hub.config["search"] = {"enabled": True}
+    index = hub.write_site_shards(site_data)
+    with open(os.path.join("data", index["search_shard"])) as f:
+        search = json.load(f)
+    with open(os.path.join("data", search["terms"]["su"])) as f:
+        terms = json.load(f)
+    assert "summary" in terms
+    assert all(
+        os.path.exists(os.path.join("data", shard))
+        for shard in search["documents"].values()
+    )
+
+
+def make_parsed_feed(feed_url):
+    return feedparser.FeedParserDict(
+        {
+            "feed": feedparser.FeedParserDict({"link": feed_url}),
+            "entries": [
+                feedparser.FeedParserDict(
+                    {"title": f"{feed_url} entry {i}", "link": f"{feed_url}/{i}"}
+                )
+                for i in range(3)
+            ],
+        }
+    )
+
+
+def test_process_feeds_concurrent_matches_serial(hub, monkeypatch):
+    monkeypatch.setattr(
+        hub, "fetch_feed", lambda feed_info: make_parsed_feed(feed_info["url"])
+    )
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_favicon_url",
+        lambda url, link, **kwargs: f"{url}/favicon.ico",
+    )
+
+    results = []
+    for max_workers in (1, 4):
+        hub.config["fetch"] = {"max_workers": max_workers}
+        hub.all_entries = []
+        hub.feeds_with_updates = []
+        hub.process_feeds()
+        results.append(
+            (
+                [entry["title"] for entry in hub.all_entries],
+                [feed["url"] for feed in hub.feeds_with_updates],
+            )
+        )
+
+    assert results[0] == results[1]
+    assert results[0][1] == [
+        "http://example.com/feed1.xml",
+        "http://example.com/feed2.xml",
+    ]
+
+
+@pytest.mark.parametrize(
+    "max_workers, slow_feed, collected, abandoned",
+    [
+        # Workers stop waiting for a fetch still running at the deadline
+        (4, "feed2.xml", "feed1.xml", "feed2.xml"),
+        # Fetches finished after the slow one are still collected
+        (4, "feed1.xml", "feed2.xml", "feed1.xml"),
+        # The serial path checks the deadline before each feed
+        (1, "feed1.xml", "feed1.xml", "feed2.xml"),
+    ],
+)
+def test_process_feeds_abandons_feeds_at_run_deadline(
+    hub, monkeypatch, max_workers, slow_feed, collected, abandoned
+):
+    import time
+
+    def fetch(feed_info):
+        if feed_info["url"].endswith(slow_feed):
+            time.sleep(0.5)
+        return make_parsed_feed(feed_info["url"])
+
+    monkeypatch.setattr(hub, "fetch_feed", fetch)
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_favicon_url", lambda url, link, **kwargs: None
+    )
+
+    hub.config["fetch"] = {"max_workers": max_workers, "run_deadline_seconds": 0.2}
+    hub.all_entries = []
+    hub.feeds_with_updates = []
+    hub.process_feeds()
+
+    assert [feed["url"] for feed in hub.feeds_with_updates] == [
+        f"http://example.com/{collected}"
+    ]
+    assert hub.feed_stats[f"http://example.com/{abandoned}"]["abandoned"]
+    assert not hub.feed_stats.get(f"http://example.com/{collected}", {}).get(
+        "abandoned"
+    )
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+RSS_CONTENT = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed 1</title><link>http://example.com/</link>
+<description>Feed description</description>
+<item><title>Cached Entry</title><link>http://example.com/cached</link>
+<pubDate>Fri, 27 Oct 2023 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def test_fetch_feed_conditional_get(hub, monkeypatch):
+    feed_info = {"title": "Feed 1", "url": "http://example.com/feed1.xml"}
+    sent_headers = []
+
+    def fake_fetch(url, extra_headers=None, **kwargs):
+        sent_headers.append(extra_headers)
+        if extra_headers:
+            return FakeResponse(status_code=304)
+        return FakeResponse(content=RSS_CONTENT, headers={"ETag": '"abc"'})
+
+    monkeypatch.setattr("scripts.fetch_feeds.fetch_with_retry", fake_fetch)
+
+    hub.feeds = [feed_info]
+    first = hub.fetch_feed(feed_info)
+    hub.save_state()
+
+    reloaded = create_mock_hub(hub.opml_file, "config.json", os.getcwd())
+    second = reloaded.fetch_feed(feed_info)
+
+    assert sent_headers[1] == {"If-None-Match": '"abc"'}
+    assert second.entries[0]["title"] == "Cached Entry"
+    assert (
+        second.entries[0]["published_parsed"] == first.entries[0]["published_parsed"]
+    )
+    assert second.feed["link"] == "http://example.com/"
+    assert second.feed["description"] == "Feed description"
+
+
+def test_process_pool_parsing_matches_inline(hub, monkeypatch):
+    def fake_fetch(url, **kwargs):
+        return FakeResponse(content=RSS_CONTENT.replace(b"Cached", url.encode()))
+
+    monkeypatch.setattr("scripts.fetch_feeds.fetch_with_retry", fake_fetch)
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_favicon_url", lambda url, link, **kwargs: None
+    )
+
+    results = []
+    for parse_workers in (1, 2):
+        hub.config["fetch"] = {"max_workers": 2, "parse_workers": parse_workers}
+        hub.all_entries = []
+        hub.feeds_with_updates = []
+        hub.process_feeds()
+        results.append(
+            (
+                [entry.copy() for entry in hub.all_entries],
+                [
+                    (feed["url"], feed["description"], feed["latest_post_ts"])
+                    for feed in hub.feeds_with_updates
+                ],
+            )
+        )
+
+    assert hub.parse_pool is None
+    assert results[0] == results[1]
+    assert results[0][0][0]["title"] == "http://example.com/feed1.xml Entry"
+    assert results[0][1][0][1] == "Feed description"
+
+
+def test_stored_copy_from_another_feed_is_not_duplicated(hub, monkeypatch, tmp_path):
+    blog, planet = "http://example.com/feed1.xml", "http://example.com/feed2.xml"
+    post = {"title": "Post X", "link": "http://blog.example/x", "id": "tag:x"}
+    carried = {blog: [post], planet: [post]}
+
+    def fetch(feed_info):
+        return feedparser.FeedParserDict(
+            {
+                "feed": feedparser.FeedParserDict({"link": feed_info["url"]}),
+                "entries": [
+                    feedparser.FeedParserDict(entry)
+                    for entry in carried[feed_info["url"]]
+                ],
+            }
+        )
+
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_favicon_url", lambda url, link, **kwargs: None
+    )
+    hub.config["dedup"] = {"enabled": True}
+    hub.config["entry_store"] = {"enabled": True, "path": str(tmp_path / "entries.db")}
+    hub.config["fetch"] = {"max_workers": 1}
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(hub.config))
+
+    for run in range(2):
+        run_hub = RSSHub(opml_file=hub.opml_file, config_file=str(config_file))
+        monkeypatch.setattr(run_hub, "fetch_feed", fetch)
+        run_hub.process_feeds()
+        # The blog drops the post before the next run; the planet keeps it
+        carried[blog] = [{"title": "Post Y", "link": "http://blog.example/y"}]
+
+    assert [entry["feed_url"] for entry in run_hub.all_entries] == [blog]
+    assert sorted(
+        (entry["title"], entry["feed_url"])
+        for entry in run_hub.entry_store.latest(10)
+    ) == [("Post X", blog), ("Post Y", blog)]
+    run_hub.entry_store.close()
+
+
+def test_fetch_feed_skips_feeds_not_due(hub, monkeypatch, tmp_path):
+    feed_info = {"title": "Feed 1", "url": "http://example.com/feed1.xml"}
+    fetched = []
+
+    def fake_fetch(url, **kwargs):
+        fetched.append(url)
+        return FakeResponse(content=RSS_CONTENT)
+
+    monkeypatch.setattr("scripts.fetch_feeds.fetch_with_retry", fake_fetch)
+
+    hub.config["schedule"] = {"enabled": True}
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(hub.config))
+
+    first_hub = RSSHub(opml_file=hub.opml_file, config_file=str(config_file))
+    first_hub.feeds = [feed_info]
+    first = first_hub.fetch_feed(feed_info)
+    first_hub.save_state()
+
+    second_hub = RSSHub(opml_file=hub.opml_file, config_file=str(config_file))
+    second = second_hub.fetch_feed(feed_info)
+
+    assert fetched == [feed_info["url"]]
+    assert second_hub.feed_stats[feed_info["url"]]["not_due"]
+    assert second.entries[0]["title"] == first.entries[0]["title"]
+
+
+def test_fetch_feed_quarantines_gone_feeds(hub, monkeypatch, tmp_path):
+    feed_info = {"title": "Feed 1", "url": "http://example.com/feed1.xml"}
+    fetched = []
+
+    def fake_fetch(url, stats=None, **kwargs):
+        fetched.append(url)
+        stats.update(status=410, error="410 Client Error: Gone")
+        return None
+
+    monkeypatch.setattr("scripts.fetch_feeds.fetch_with_retry", fake_fetch)
+
+    hub.config["backoff"] = {"enabled": True}
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(hub.config))
+
+    first_hub = RSSHub(opml_file=hub.opml_file, config_file=str(config_file))
+    first_hub.feeds = [feed_info]
+    assert first_hub.fetch_feed(feed_info) is None
+    first_hub.save_state()
+
+    second_hub = RSSHub(opml_file=hub.opml_file, config_file=str(config_file))
+    second_hub.feeds = [feed_info]
+    assert second_hub.fetch_feed(feed_info) is None
+    report = second_hub.save_run_report(1.0)
+
+    assert fetched == [feed_info["url"]]
+    assert report["backed_off_count"] == 1
+    assert [failure["url"] for failure in report["quarantined"]] == [feed_info["url"]]
+
+
+def test_parse_opml_nested_categories_and_duplicates(tmp_path, config_file):
+    opml_file = tmp_path / "nested.opml"
+    opml_file.write_text(
+        """<?xml version="1.0"?>
+        <opml version="1.0">
+            <body>
+                <outline text="Technology" title="Technology">
+                    <outline title="Feed 1" xmlUrl="http://example.com/feed1.xml"/>
+                    <outline text="Python">
+                        <outline title="Feed 2" xmlUrl="http://example.com/feed2.xml"/>
+                    </outline>
+                    <outline title="Feed 3" category="News" xmlUrl="http://example.com/feed3.xml"/>
+                </outline>
+                <outline title="Feed 1 again" xmlUrl="http://example.com/feed1.xml"/>
+                <outline title="Feed 4" xmlUrl="http://example.com/feed4.xml"/>
+            </body>
+        </opml>
+        """
+    )
+    hub = RSSHub(opml_file=str(opml_file), config_file=config_file)
+    feeds = hub.parse_opml()
+
+    assert [(feed["title"], feed["category"]) for feed in feeds] == [
+        ("Feed 1", "Technology"),
+        ("Feed 2", "Python"),
+        ("Feed 3", "News"),
+        ("Feed 4", ""),
+    ]
+
+
+def test_top_k_selection_matches_full_sort(hub):
+    import time
+
+    hub.all_entries = [
+        feedparser.FeedParserDict(
+            {
+                "title": f"Entry {day}",
+                "link": f"http://example.com/{day}",
+                "published_parsed": time.strptime(f"2023-10-{day:02d}", "%Y-%m-%d"),
+                "feed_url": f"http://example.com/feed{day % 2}.xml",
+            }
+        )
+        for day in (3, 9, 1, 7, 5)
+    ]
+    hub.feeds_with_updates = [
+        {"title": "Feed 0", "url": "http://example.com/feed0.xml"},
+        {"title": "Feed 1", "url": "http://example.com/feed1.xml"},
+    ]
+    hub.config["max_entries"]["rss"] = 3
+    hub.generate_latest_rss()
+
+    with open(hub.config["output_files"]["rss"]) as f:
+        content = f.read()
+    titles = [line.strip() for line in content.splitlines() if "<title>Entry" in line]
+    assert titles == [f"<title>Entry {day}</title>" for day in (9, 7, 5)]
+
+    site_data = hub.generate_site_data()
+    feed1_titles = [
+        e["title"] for e in site_data["entries_by_feed"]["http://example.com/feed1.xml"]
+    ]
+    assert feed1_titles == ["Entry 9", "Entry 7", "Entry 5", "Entry 3", "Entry 1"]
+
+
+def test_streamed_rss_matches_elementtree(hub, monkeypatch):
+    import xml.etree.ElementTree as ET
+
+    monkeypatch.setattr(
+        "scripts.fetch_feeds.get_readable_timestamp", lambda: "2023-10-27 10:00:00 UTC"
+    )
+    hub.config["max_entries"]["rss"] = 2
+    hub.all_entries[1]["summary"] = "<p>Fish &amp; chips</p>"
+    hub.generate_latest_rss()
+
+    # Reference document built the way the generator did with ElementTree
+    rss = ET.Element("rss", version="2.0")
+    rss.set("xmlns:atom", "http://www.w3.org/2005/Atom")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = "Test Site"
+    ET.SubElement(channel, "description").text = "Test Description"
+    ET.SubElement(channel, "link").text = "http://example.com"
+    ET.SubElement(channel, "lastBuildDate").text = "2023-10-27 10:00:00 UTC"
+    ET.SubElement(channel, "generator").text = "TestGenerator/1.0"
+    atom_link = ET.SubElement(channel, "{http://www.w3.org/2005/Atom}link")
+    atom_link.set("href", "./test_rss.xml")
+    atom_link.set("rel", "self")
+    atom_link.set("type", "application/rss+xml")
+    for number, summary, published in (
+        (1, "Summary 1", "2023-10-27T10:00:00Z"),
+        (2, "Fish & chips", "2023-10-26T10:00:00Z"),
+    ):
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = f"Entry {number}"
+        ET.SubElement(item, "link").text = f"http://example.com/entry{number}"
+        ET.SubElement(item, "description").text = summary
+        ET.SubElement(item, "pubDate").text = published
+        guid = ET.SubElement(item, "guid")
+        guid.text = f"http://example.com/entry{number}"
+        guid.set("isPermaLink", "true")
+        source = ET.SubElement(item, "source")
+        source.text = f"Feed {number}"
+        source.set("url", f"http://example.com/feed{number}.xml")
+    tree = ET.ElementTree(rss)
+    ET.indent(tree, space="  ", level=0)
+    tree.write("expected_rss.xml", encoding="utf-8", xml_declaration=True)
+
+    with open("test_rss.xml", "rb") as actual, open("expected_rss.xml", "rb") as expected:
+        assert actual.read() == expected.read()
@@ -0,0 +1,39 @@
+import sys
+import time
+
+sys.path.append("scripts")
+import feedparser
+from scripts.models import Entry, entry_timestamp
+
+
+def test_entry_from_parsed():
+    parsed_entry = feedparser.FeedParserDict(
+        {
+            "title": "Entry 1",
+            "link": "http://example.com/entry1",
+            "published": "Fri, 27 Oct 2023 10:00:00 GMT",
+            "published_parsed": time.strptime("2023-10-27 10:00", "%Y-%m-%d %H:%M"),
+            "content": [{"value": "<p>Full content</p>"}],
+        }
+    )
+    entry = Entry.from_parsed(
+        parsed_entry, {"title": "Feed 1", "url": "http://example.com/feed1.xml"}, None
+    )
+
+    assert entry.published_ts == 1698400800
+    assert entry.published_parsed[:6] == (2023, 10, 27, 10, 0, 0)
+    assert entry_timestamp(entry) == entry_timestamp(parsed_entry)
+    assert entry["feed_title"] == "Feed 1"
+    assert entry.get("summary", "none") == "none"
+    assert entry.get("content") is None
+    assert not hasattr(entry, "__dict__")
+    assert entry.copy() == {
+        "title": "Entry 1",
+        "link": "http://example.com/entry1",
+        "published": "Fri, 27 Oct 2023 10:00:00 GMT",
+        "published_ts": 1698400800,
+        "published_parsed": entry.published_parsed,
+        "feed_title": "Feed 1",
+        "feed_url": "http://example.com/feed1.xml",
+        "feed_category": "",
+    }
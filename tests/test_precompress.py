@@ -0,0 +1,63 @@
+import gzip
+import os
+import sys
+
+sys.path.append("scripts")
+from scripts import precompress
+from scripts.precompress import precompress_file, precompress_files
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_precompress_files_writes_gzip_siblings(tmp_path, monkeypatch):
+    monkeypatch.setattr(precompress, "brotli", None)
+    large = write(tmp_path / "index.html", b"<p>lovely</p>" * 200)
+    small = write(tmp_path / "tiny.json", b"[]")
+
+    written = precompress_files([large, small, str(tmp_path / "missing.xml")])
+
+    assert written == [large + ".gz"]
+    with gzip.open(large + ".gz") as f:
+        assert f.read() == b"<p>lovely</p>" * 200
+    assert not os.path.exists(small + ".gz")
+    assert not os.path.exists(large + ".br")
+
+
+def test_precompress_file_skips_fresh_and_removes_stale_siblings(tmp_path, monkeypatch):
+    monkeypatch.setattr(precompress, "brotli", None)
+    path = write(tmp_path / "latest_rss.xml", b"<rss/>" * 500)
+
+    assert precompress_file(path) == [path + ".gz"]
+    first = open(path + ".gz", "rb").read()
+    assert precompress_file(path) == []
+
+    # Rewritten files get new siblings, with identical bytes for identical input
+    os.utime(path + ".gz", (0, 0))
+    assert precompress_file(path) == [path + ".gz"]
+    assert open(path + ".gz", "rb").read() == first
+
+    # Files that shrank below the threshold lose their siblings
+    write(tmp_path / "latest_rss.xml", b"<rss/>")
+    assert precompress_file(path) == []
+    assert not os.path.exists(path + ".gz")
+
+
+def test_precompress_file_writes_brotli_when_available(tmp_path, monkeypatch):
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            return b"br:" + data[:4]
+
+    monkeypatch.setattr(precompress, "brotli", FakeBrotli)
+    path = write(tmp_path / "index.html", b"<html>" * 500)
+
+    assert precompress_file(path) == [path + ".gz", path + ".br"]
+    assert open(path + ".br", "rb").read() == b"br:<htm"
+    # Turning brotli off removes the .br siblings, which would go stale
+    assert precompress_file(path, use_brotli=False) == []
+    assert not os.path.exists(path + ".br")
+    assert os.path.exists(path + ".gz")
@@ -0,0 +1,66 @@
+import sys
+import time
+from email.utils import formatdate
+
+import requests
+
+sys.path.append("scripts")
+from scripts.retry import Deadline, RetryPolicy, parse_retry_after
+
+
+def make_http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(f"{status} Error", response=response)
+
+
+def test_only_transient_errors_are_retryable():
+    policy = RetryPolicy()
+
+    for status in (408, 429, 500, 502, 503, 504):
+        assert policy.is_retryable(make_http_error(status))
+    for status in (400, 401, 403, 404, 410):
+        assert not policy.is_retryable(make_http_error(status))
+
+    assert policy.is_retryable(requests.exceptions.ConnectTimeout())
+    assert policy.is_retryable(requests.exceptions.ReadTimeout())
+    assert policy.is_retryable(requests.exceptions.ConnectionError())
+    assert not policy.is_retryable(requests.exceptions.SSLError())
+    assert not policy.is_retryable(requests.exceptions.InvalidURL())
+
+
+def test_backoff_uses_full_jitter_up_to_max_delay():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    for attempt in range(6):
+        for _ in range(20):
+            assert 0 <= policy.backoff(attempt) <= min(5, 2**attempt)
+
+
+def test_backoff_honors_retry_after():
+    policy = RetryPolicy(max_delay=30)
+
+    assert policy.backoff(0, make_http_error(429, {"Retry-After": "7"}).response) == 7
+    assert policy.backoff(0, make_http_error(503, {"Retry-After": "120"}).response) is None
+
+    retry_at = formatdate(time.time() + 10, usegmt=True)
+    delay = policy.backoff(0, make_http_error(503, {"Retry-After": retry_at}).response)
+    assert 8 <= delay <= 10
+
+
+def test_parse_retry_after_rejects_invalid_values():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(" 3 ") == 3
+
+
+def test_deadline():
+    assert Deadline().remaining() is None
+    assert not Deadline().expired()
+    assert 0 < Deadline(60).remaining() <= 60
+    assert Deadline(0.000001).remaining() < 1
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired()
+    assert deadline.remaining() == 0
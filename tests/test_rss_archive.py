@@ -0,0 +1,33 @@
+import sys
+
+sys.path.append("scripts")
+from scripts.rss_archive import RSSArchive
+
+
+def make_entry(number):
+    return {"id": f"entry-{number}", "published": f"2023-10-{number:02d}T10:00:00Z"}
+
+
+def test_split_archives_full_pages_and_persists(tmp_path):
+    path = str(tmp_path / "rss_archive.json")
+    archive = RSSArchive(path, page_size=2)
+    entries = [make_entry(number) for number in range(1, 6)]
+
+    current, pages = archive.split(reversed(entries))
+    assert [entry["id"] for entry in current] == ["entry-5", "entry-4", "entry-3"]
+    assert [[entry["id"] for entry in page] for page in pages] == [
+        ["entry-2", "entry-1"]
+    ]
+
+    archive.add_page("rss-first.xml", pages[0])
+    archive.save()
+    archive = RSSArchive(path, page_size=2)
+    assert archive.latest_page == "rss-first.xml"
+
+    # Archived entries stay archived; new ones fill the current page
+    entries.append(make_entry(6))
+    current, pages = archive.split(entries)
+    assert [entry["id"] for entry in current] == ["entry-6", "entry-5"]
+    assert [[entry["id"] for entry in page] for page in pages] == [
+        ["entry-4", "entry-3"]
+    ]
@@ -0,0 +1,64 @@
+import sys
+
+sys.path.append("scripts")
+from scripts.entry_store import EntryStore
+from scripts.search_index import (
+    build_search_shards,
+    entry_terms,
+    index_entries,
+    search_document,
+    tokenize,
+)
+
+
+def test_tokenize():
+    assert tokenize("The Rust 2024 edition, in <b>Rust</b>!") == {
+        "rust",
+        "2024",
+        "edition",
+    }
+    assert tokenize("Überblick über Straße") == {"überblick", "über", "straße"}
+    assert tokenize("") == set()
+
+
+def test_shards_group_terms_by_prefix_with_gap_encoded_ids():
+    entries = [
+        {"title": "Python tips", "summary": "<p>Fast loops</p>", "feed_title": "Blog"},
+        {"title": "Python news", "link": "http://example.com/2"},
+        {"title": "Pygame", "feed_title": "Blog"},
+    ]
+    postings, documents = index_entries(entries)
+    term_shards, document_shards = build_search_shards(postings, documents)
+
+    assert term_shards["py"] == {"pygame": [2], "python": [0, 1]}
+    assert term_shards["bl"] == {"blog": [0, 2]}
+    assert term_shards["fa"] == {"fast": [0]}
+    assert document_shards == {
+        0: {str(doc_id): document for doc_id, document in documents}
+    }
+    assert document_shards[0]["1"] == ["Python news", "http://example.com/2", "", 0]
+
+
+def test_store_indexes_only_new_or_changed_entries(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    entries = [
+        {"id": "1", "title": "Python tips", "feed_url": "http://a.example/feed"},
+        {"id": "2", "title": "Rust news", "feed_url": "http://a.example/feed"},
+    ]
+    store.upsert_entries(entries)
+    assert store.update_search_index(entry_terms) == 2
+    assert store.update_search_index(entry_terms) == 0
+
+    entries[1]["title"] = "Go news"
+    store.upsert_entries(entries)
+    assert store.update_search_index(entry_terms) == 1
+    store.remove([("http://a.example/feed", "1")])
+    assert store.update_search_index(entry_terms) == 0
+
+    postings = list(store.search_postings())
+    assert [term for term, _ in postings] == ["go", "news"]
+    documents = {
+        doc_id: search_document(entry) for doc_id, entry in store.search_documents()
+    }
+    assert [documents[doc_id][0] for _, doc_id in postings] == ["Go news"] * 2
+    store.close()
@@ -1,4 +1,8 @@
+import sys
+
 import pytest
+
+sys.path.append("scripts")
 from scripts.utils import (
     clean_html,
     validate_url,
@@ -10,6 +14,15 @@ from scripts.utils import (
     is_github_profile_feed,
     extract_github_username,
     is_youtube_feed,
+    configure_http,
+    FAVICON_PROBE_WORKERS,
+    get_http_session,
+    fetch_with_retry,
+    probe_favicon_candidates,
+    discover_favicon_url,
+    keep_clean_html,
+    load_clean_html_cache,
+    save_clean_html_cache,
 )
 
 def test_clean_html():
@@ -91,3 +104,295 @@ def test_get_favicon_url_special_domains():
 
     favicon_url = get_favicon_url("https://hnrss.org/frontpage", "https://news.ycombinator.com/")
     assert favicon_url == "https://news.ycombinator.com/favicon.ico"
+
+def test_configure_http_shared_pooled_session(monkeypatch):
+    session = configure_http({"pool_connections": 5, "pool_maxsize": 2, "timeout": 7})
+    assert get_http_session() is session
+    adapter = session.get_adapter("https://example.com/feed.xml")
+    assert adapter._pool_connections == 5
+    assert adapter._pool_maxsize == 2
+
+    calls = []
+
+    class Response:
+        status_code = 200
+        headers = {}
+        content = b"<rss/>"
+
+        def iter_content(self, chunk_size):
+            yield self.content
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, timeout, headers, stream):
+        calls.append((url, timeout))
+        return Response()
+
+    monkeypatch.setattr(session, "get", fake_get)
+    assert fetch_with_retry("https://example.com/feed.xml") is not None
+    assert calls == [("https://example.com/feed.xml", 7)]
+
+    # A later configuration starts from the defaults again
+    session = configure_http({"pool_maxsize": 4})
+    adapter = session.get_adapter("https://example.com/feed.xml")
+    assert adapter._pool_connections == 50
+    assert adapter._pool_maxsize == 4
+
+    # By default every fetch and favicon probe thread can keep a connection
+    session = configure_http(fetch_workers=8)
+    adapter = session.get_adapter("https://example.com/feed.xml")
+    assert adapter._pool_maxsize == 8 + FAVICON_PROBE_WORKERS
+    configure_http()
+
+def test_get_favicon_url_cache(monkeypatch):
+    lookups = []
+
+    def fake_discover(base_url, base_domain, time_budget=None):
+        lookups.append(base_domain)
+        return None, "timeout" not in base_domain
+
+    monkeypatch.setattr("scripts.utils.discover_favicon_url", fake_discover)
+    cache = {}
+
+    assert get_favicon_url("https://example.com/feed.xml", "https://example.com/blog", cache=cache, cache_ttl=3600) is None
+    assert get_favicon_url("https://example.com/other.xml", None, cache=cache, cache_ttl=3600) is None
+    assert lookups == ["https://example.com"]
+    assert cache["https://example.com"]["url"] is None
+
+    get_favicon_url("https://example.com/feed.xml", None, cache=cache, cache_ttl=3600, force_refresh=True)
+    get_favicon_url("https://example.com/feed.xml", None, cache=cache, cache_ttl=0)
+    assert len(lookups) == 3
+
+    # A lookup cut short is not cached as "not found"
+    assert get_favicon_url("https://timeout.example/feed.xml", None, cache=cache, cache_ttl=3600) is None
+    assert "https://timeout.example" not in cache
+
+def test_discover_favicon_url_with_no_budget_left(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no request should be made")
+
+    monkeypatch.setattr("scripts.utils.fetch_with_retry", fail)
+    monkeypatch.setattr("scripts.utils.probe_favicon_candidates", fail)
+    assert discover_favicon_url("https://example.com/", "https://example.com", 0.0) == (None, False)
+
+def test_probe_favicon_candidates_priority_and_budget(monkeypatch):
+    import time as time_module
+
+    def fake_test(url, timeout=None):
+        if "slow" in url:
+            time_module.sleep(0.5)
+        if "unreachable" in url:
+            return None
+        return "ok" in url
+
+    monkeypatch.setattr("scripts.utils.test_favicon_url", fake_test)
+
+    # A reachable lower-priority probe does not beat a reachable higher-priority one
+    assert probe_favicon_candidates(
+        ["https://a/slow-ok.ico", "https://a/ok.ico"]
+    ) == ("https://a/slow-ok.ico", True)
+    assert probe_favicon_candidates(
+        ["https://a/missing.ico", "https://a/ok.png", "https://a/ok.ico"]
+    ) == ("https://a/ok.png", True)
+
+    # Only probes that all got an answer make "not found" final
+    assert probe_favicon_candidates(["https://a/missing.ico"]) == (None, True)
+    assert probe_favicon_candidates(
+        ["https://a/missing.ico", "https://a/unreachable.ico"]
+    ) == (None, False)
+
+    # The budget stops waiting on slow probes
+    start = time_module.monotonic()
+    assert probe_favicon_candidates(
+        ["https://a/slow-ok.ico"], deadline=time_module.monotonic() + 0.1
+    ) == (None, False)
+    assert time_module.monotonic() - start < 0.4
+
+def test_probe_favicon_candidates_cancels_queued_probes(monkeypatch):
+    import time as time_module
+    from concurrent.futures import ThreadPoolExecutor
+
+    probed = []
+
+    def fake_test(url, timeout=None):
+        probed.append(url)
+        return True
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr("scripts.utils._probe_executor", executor)
+    monkeypatch.setattr("scripts.utils.test_favicon_url", fake_test)
+    # Occupy the single worker, so the probes are still queued at the deadline
+    blocker = executor.submit(time_module.sleep, 0.3)
+
+    assert probe_favicon_candidates(
+        ["https://a/1.ico", "https://a/2.ico"], deadline=time_module.monotonic() + 0.1
+    ) == (None, False)
+    blocker.result()
+    executor.shutdown(wait=True)
+    assert probed == []
+
+def test_clean_html_matches_beautifulsoup():
+    import html
+    import re
+    from bs4 import BeautifulSoup
+
+    def reference(text):
+        soup = BeautifulSoup(text, 'html.parser')
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return re.sub(r'\s+', ' ', html.unescape(soup.get_text())).strip()
+
+    samples = [
+        "<p>Hello <b>world</b></p><style>p { color: red }</style>",
+        "<![CDATA[cdata]]> &amp;lt;tag&amp;gt; &copy 2023 &unknown; &#150;",
+        "<!-- comment --><ruby>漢<rt>kan</rt></ruby><template>hidden</template>",
+        "<b><rt>closed by b</b> visible <script>unclosed",
+        "<div>line\n\tbreaks<br>and&nbsp;spaces</div>",
+    ]
+    for sample in samples:
+        assert clean_html(sample) == reference(sample)
+
+
+def test_clean_html_cache_roundtrip(tmp_path):
+    import scripts.utils as utils
+
+    cache_file = str(tmp_path / "clean_html_cache.json")
+    assert clean_html("<p>Cached summary</p>") == "Cached summary"
+    save_clean_html_cache(cache_file)
+
+    utils._clean_html_cache.clear()
+    load_clean_html_cache(cache_file)
+    assert "Cached summary" in utils._clean_html_cache.values()
+
+    # A run that skips an unchanged output keeps the summaries it would show
+    utils._clean_html_used.clear()
+    keep_clean_html(["<p>Cached summary</p>"])
+    save_clean_html_cache(cache_file)
+    utils._clean_html_cache.clear()
+    load_clean_html_cache(cache_file)
+    assert list(utils._clean_html_cache.values()) == ["Cached summary"]
+
+def test_fetch_with_retry_records_stats():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = 404 if self.path == "/missing" else 200
+            body = b"<rss>feed</rss>"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        stats = {}
+        assert fetch_with_retry(f"{base_url}/feed.xml", stats=stats) is not None
+        assert stats["status"] == 200
+        assert stats["bytes"] == len(b"<rss>feed</rss>")
+        assert stats["retries"] == 0
+        assert 0 < stats["connect_time"] <= stats["response_time"]
+
+        stats = {}
+        assert fetch_with_retry(f"{base_url}/missing", retries=2, stats=stats) is None
+        assert stats["status"] == 404
+        assert stats["retries"] == 0  # 404 is not worth retrying
+        assert "404" in stats["error"]
+    finally:
+        server.shutdown()
+
+
+def test_fetch_with_retry_retries_transient_errors():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from scripts.retry import Deadline
+
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            # Every path fails once with a Retry-After, then succeeds
+            status = 503 if requests_seen.count(self.path) == 1 else 200
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        stats = {}
+        assert fetch_with_retry(f"{base_url}/feed.xml", stats=stats) is not None
+        assert stats["retries"] == 1
+        assert stats["status"] == 200
+
+        stats = {}
+        deadline = Deadline(0.000001)
+        assert fetch_with_retry(f"{base_url}/late.xml", stats=stats, deadline=deadline) is None
+        assert stats["abandoned"]
+        assert "/late.xml" not in requests_seen
+    finally:
+        server.shutdown()
+
+
+def test_fetch_with_retry_decompresses_and_caps_body_size():
+    import gzip
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    feed = b"<rss>" + b"<item>entry</item>" * 1000 + b"</rss>"
+    seen_headers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen_headers.append(dict(self.headers))
+            body = gzip.compress(feed)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            if self.path != "/undeclared.xml":
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        stats = {}
+        response = fetch_with_retry(f"{base_url}/feed.xml", stats=stats)
+        assert response.content == feed
+        assert stats["bytes"] == len(feed)
+        assert stats["wire_bytes"] < stats["bytes"]
+        assert "gzip" in seen_headers[0]["Accept-Encoding"]
+        assert seen_headers[0]["Accept"].startswith("application/rss+xml")
+
+        # Declared too large: aborted before reading, and not retried
+        stats = {}
+        assert fetch_with_retry(f"{base_url}/feed.xml", stats=stats, max_bytes=100) is None
+        assert "byte limit" in stats["error"]
+        assert stats["retries"] == 0
+
+        # Decoded body too large: aborted while streaming
+        stats = {}
+        assert (
+            fetch_with_retry(f"{base_url}/undeclared.xml", stats=stats, max_bytes=5000)
+            is None
+        )
+        assert "byte limit" in stats["error"]
+    finally:
+        server.shutdown()
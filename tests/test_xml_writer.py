@@ -0,0 +1,39 @@
+import io
+import xml.etree.ElementTree as ET
+
+from scripts.xml_writer import XMLStreamWriter
+
+
+def write_with_elementtree(root):
+    tree = ET.ElementTree(root)
+    ET.indent(tree, space="  ", level=0)
+    output = io.BytesIO()
+    tree.write(output, encoding="utf-8", xml_declaration=True)
+    return output.getvalue().decode("utf-8")
+
+
+def test_matches_elementtree_output():
+    root = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(root, "channel")
+    ET.SubElement(channel, "title").text = "Fish & <Chips> \"quoted\"\nnext line"
+    ET.SubElement(channel, "empty").text = ""
+    ET.SubElement(channel, "link", href='a&b "c"\t\r\n', rel="self")
+    ET.SubElement(ET.SubElement(channel, "item"), "guid", isPermaLink="false").text = "ü"
+    ET.SubElement(channel, "childless")
+
+    output = io.StringIO()
+    writer = XMLStreamWriter(output)
+    writer.start("rss", [("version", "2.0")])
+    writer.start("channel")
+    writer.element("title", "Fish & <Chips> \"quoted\"\nnext line")
+    writer.element("empty", "")
+    writer.element("link", attrib=[("href", 'a&b "c"\t\r\n'), ("rel", "self")])
+    writer.start("item")
+    writer.element("guid", "ü", [("isPermaLink", "false")])
+    writer.end()
+    writer.start("childless")
+    writer.end()
+    writer.end()
+    writer.end()
+
+    assert output.getvalue() == write_with_elementtree(root)